@@ -0,0 +1,286 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dev_code.startup_time import measure_startup
+from text_mining_package import find_dates, find_dates_in_file
+from text_mining_package.batch_date_finder import find_date
+from text_mining_package.date_finder import DateFinderx
+from text_mining_package.date_records import iter_date_records, iter_date_records_in_file
+from text_mining_package.vectorized_date_finder import extract_date_columns
+
+"""
+Benchmark suite for the date extraction paths.
+
+Synthetic corpora follow the format mix of dates.txt: numeric dates, month name dates, month/year, year only and
+notes without a date. Every path is measured for throughput and peak memory; DateFinderx is also measured for per
+line latency percentiles, and the package for cold start. Results are written as JSON, and can be compared against a
+stored baseline: the run fails when a path gets slower or bigger than the threshold allows.
+
+    python dev_code/benchmark_suite.py --sizes 1000 100000 --output bench.json --baseline bench_baseline.json
+"""
+
+MONTHS_SHORT = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+MONTHS_LONG = ('January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October',
+               'November', 'December')
+NOTE_TEXT = ('Total time of visit (in minutes):', 'Primary Care Doctor:', 'CPT Code: 90792: With medical services',
+             'SOS-10 Total Score:', 'Audit C Score Current:', 'Communication with referring physician?: Done',
+             'Other Child Mental Health Outcomes Scales Used:', 'Patient reports she has been sleeping poorly.',
+             'Relevant Drug History:', 'Pain Treatment Pain Level (Numeric Scale): 7', '[report_end]')
+
+# Share of each format in the corpus, roughly as in dates.txt, plus notes without a date.
+FORMAT_WEIGHTS = {'numeric': 0.42, 'month_name': 0.24, 'month_year': 0.14, 'year_only': 0.1, 'no_date': 0.1}
+# Size of the corpus every path runs over, untimed, before it is measured.
+WARMUP_LINES = 1000
+
+
+def synthetic_note(rnd: random.Random) -> str:
+    """
+    Builds one synthetic note in one of the formats of FORMAT_WEIGHTS.
+    :param rnd: random number generator
+    :return: note text
+    """
+    note_format = rnd.choices(tuple(FORMAT_WEIGHTS), weights=tuple(FORMAT_WEIGHTS.values()))[0]
+    month, day, year = rnd.randint(1, 12), rnd.randint(1, 28), rnd.randint(1920, 2015)
+    if note_format == 'numeric':
+        separator = rnd.choice('/-') if rnd.random() < 0.2 else '/'
+        year_text = str(year) if rnd.random() < 0.3 else f"{year % 100:02d}"
+        date = f"{month:0{rnd.choice((1, 2))}d}{separator}{day:0{rnd.choice((1, 2))}d}{separator}{year_text}"
+    elif note_format == 'month_name':
+        name = rnd.choice((MONTHS_SHORT, MONTHS_LONG))[month - 1]
+        date = rnd.choice((f"{day} {name} {year}", f"{name} {day}, {year}", f"{name}. {day}, {year}",
+                           f"{name} {day} {year}", f"{day} {name}, {year}"))
+    elif note_format == 'month_year':
+        date = rnd.choice((f"{MONTHS_SHORT[month - 1]} {year}", f"{MONTHS_LONG[month - 1]}, {year}", f"{month}/{year}"))
+    elif note_format == 'year_only':
+        date = str(year)
+    else:
+        return rnd.choice(NOTE_TEXT)
+    prefix = rnd.choice(('', '', '(', 'Per ', 'seen on ', '4, '))
+    return f"{prefix}{date} {rnd.choice(NOTE_TEXT)}"
+
+
+def write_corpus(path: Path, lines: int = 1000, seed: int = 0) -> Path:
+    """
+    Writes a synthetic corpus, one note per line, without holding it in memory.
+    :param path: file to write
+    :param lines: number of notes
+    :param seed: random seed, the same seed always gives the same corpus.
+    :return: path
+    """
+    rnd = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        for _ in range(lines):
+            file.write(synthetic_note(rnd) + "\n")
+    return path
+
+
+def read_corpus(path: Path) -> typing.Iterator[str]:
+    """
+    Streams the notes of a corpus file.
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            yield line.rstrip("\n")
+
+
+def run_date_finder(path: Path, workers: int = 1) -> int:
+    count = 0
+    for raw_text in read_corpus(path):
+        try:
+            DateFinderx(raw_text=raw_text)
+        except (AttributeError, TypeError):
+            pass
+        count += 1
+    return count
+
+
+def run_find_dates(path: Path, workers: int = 1) -> int:
+    return sum(1 for _ in find_dates(read_corpus(path), workers=workers))
+
+
+def run_find_dates_in_file(path: Path, workers: int = 1) -> int:
+    return sum(1 for _ in find_dates_in_file(path, workers=workers))
+
+
+def run_date_records(path: Path, workers: int = 1) -> int:
+    return sum(len(records) for records in iter_date_records(read_corpus(path), workers=workers))
+
+
+def run_date_records_in_file(path: Path, workers: int = 1) -> int:
+    return sum(len(records) for records in iter_date_records_in_file(path, workers=workers))
+
+
+def run_vectorized(path: Path, workers: int = 1) -> int:
+    return len(extract_date_columns(notes=pd.Series(data=list(read_corpus(path)))))
+
+
+def run_series_apply(path: Path, workers: int = 1) -> int:
+    # The row by row pandas baseline the vectorized path is measured against.
+    return len(pd.Series(data=list(read_corpus(path))).apply(find_date))
+
+
+BENCHMARK_PATHS = {'date_finder': run_date_finder, 'find_dates': run_find_dates,
+                   'find_dates_in_file': run_find_dates_in_file, 'date_records': run_date_records,
+                   'date_records_in_file': run_date_records_in_file, 'vectorized': run_vectorized,
+                   'series_apply': run_series_apply}
+
+
+def measure_path(run: typing.Callable, path: Path, workers: int = 1, warmup_path: Path = None) -> dict:
+    """
+    Measures one path over one corpus: an untimed run over warmup_path, so lazy imports, compiled scanners and tables
+    are in place, a timed run, then a run under tracemalloc for peak memory (tracing slows the code down, so the two
+    are kept apart). Peak memory covers the calling process only.
+    :return: dictionary of lines, seconds, lines_per_second and peak_memory_bytes
+    """
+    if warmup_path is not None:
+        run(warmup_path, workers)
+    gc.collect()
+    start = time.perf_counter()
+    lines = run(path, workers)
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    run(path, workers)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'lines': lines, 'seconds': seconds, 'lines_per_second': lines / seconds if seconds else 0.0,
+            'peak_memory_bytes': peak_memory}
+
+
+def measure_latency(path: Path, sample: int = 10000) -> dict:
+    """
+    Times DateFinderx on each of the first sample notes of the corpus.
+    :return: dictionary of latency percentiles in nanoseconds
+    """
+    latencies = []
+    for line_number, raw_text in enumerate(read_corpus(path)):
+        if line_number >= sample:
+            break
+        start = time.perf_counter_ns()
+        try:
+            DateFinderx(raw_text=raw_text)
+        except (AttributeError, TypeError):
+            pass
+        latencies.append(time.perf_counter_ns() - start)
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {'p50': cuts[49], 'p90': cuts[89], 'p99': cuts[98], 'max': max(latencies)}
+
+
+def run_suite(sizes: typing.Sequence[int], paths: typing.Sequence[str], workers: int = 1, seed: int = 0,
+              vectorized_max: int = 10 ** 6, startup_runs: int = 10) -> dict:
+    """
+    Runs every path over a corpus of every size.
+    :return: dictionary ready to be written as JSON
+    """
+    report = {'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                              'workers': workers, 'seed': seed},
+              'cold_start': measure_startup(runs=startup_runs), 'results': []}
+    with tempfile.TemporaryDirectory() as directory:
+        warmup_corpus = write_corpus(path=Path(directory) / "warmup.txt", lines=WARMUP_LINES, seed=seed + 1)
+        for size in sizes:
+            corpus = write_corpus(path=Path(directory) / f"corpus_{size}.txt", lines=size, seed=seed)
+            for name in paths:
+                if name in ('vectorized', 'series_apply') and size > vectorized_max:
+                    continue
+                measurement = measure_path(run=BENCHMARK_PATHS[name], path=corpus, workers=workers,
+                                           warmup_path=warmup_corpus)
+                result = {'path': name, 'size': size, **measurement}
+                if name == 'date_finder':
+                    result['latency_ns'] = measure_latency(path=corpus)
+                report['results'].append(result)
+                print(f"{name:>22} {size:>10,} lines {result['lines_per_second']:>12,.0f} lines/s "
+                      f"{result['peak_memory_bytes'] / 2 ** 20:>9.1f} MiB")
+    return report
+
+
+def environment_differences(report: dict, baseline: dict) -> list:
+    """
+    The purpose of this function is to tell whether a run can be compared with a baseline: numbers taken with other
+    workers, another corpus seed, another Python or another platform are not comparable.
+    :param report: results of this run
+    :param baseline: stored results
+    :return: list of difference messages, empty when the environments match.
+    """
+    environment, reference = report['environment'], baseline.get('environment', {})
+    return [f"{key}: {environment.get(key)!r}, baseline {reference.get(key)!r}"
+            for key in ('workers', 'seed', 'python', 'platform') if environment.get(key) != reference.get(key)]
+
+
+def compare_to_baseline(report: dict, baseline: dict, threshold: float = 0.1) -> list:
+    """
+    The purpose of this function is to find regressions: a path running slower, or using more memory, than the
+    baseline allows for the same corpus size.
+    :param report: results of this run
+    :param baseline: stored results
+    :param threshold: allowed relative change, 0.1 is 10%
+    :return: list of regression messages, empty when there are none.
+    """
+    baseline_results = {(result['path'], result['size']): result for result in baseline.get('results', [])}
+    regressions = []
+    for result in report['results']:
+        reference = baseline_results.get((result['path'], result['size']))
+        if reference is None:
+            continue
+        if result['lines_per_second'] < reference['lines_per_second'] * (1 - threshold):
+            regressions.append(f"{result['path']} at {result['size']:,} lines: {result['lines_per_second']:,.0f} "
+                               f"lines/s, baseline {reference['lines_per_second']:,.0f}")
+        if result['peak_memory_bytes'] > reference['peak_memory_bytes'] * (1 + threshold):
+            regressions.append(f"{result['path']} at {result['size']:,} lines: {result['peak_memory_bytes']:,} bytes "
+                               f"peak, baseline {reference['peak_memory_bytes']:,}")
+    reference_start = baseline.get('cold_start', {}).get('first_date_ms')
+    if reference_start and report['cold_start']['first_date_ms'] > reference_start * (1 + threshold):
+        regressions.append(f"cold start: {report['cold_start']['first_date_ms']:.1f} ms to first date, baseline "
+                           f"{reference_start:.1f} ms")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the date extraction paths on synthetic corpora.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10 ** 3, 10 ** 4, 10 ** 5],
+                        help="corpus sizes in lines, from 1000 up to 10000000")
+    parser.add_argument("--paths", nargs="+", choices=tuple(BENCHMARK_PATHS), default=tuple(BENCHMARK_PATHS))
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--vectorized-max", type=int, default=10 ** 6,
+                        help="largest corpus for the vectorized and series_apply paths, which hold the corpus in "
+                             "memory")
+    parser.add_argument("--output", type=Path, default=Path("bench_output.json"))
+    parser.add_argument("--baseline", type=Path, help="stored results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative regression")
+    parser.add_argument("--ignore-environment", action="store_true",
+                        help="compare with a baseline taken in another environment, with a warning")
+    arguments = parser.parse_args()
+
+    suite_report = run_suite(sizes=arguments.sizes, paths=arguments.paths, workers=arguments.workers,
+                             seed=arguments.seed, vectorized_max=arguments.vectorized_max)
+    arguments.output.write_text(json.dumps(suite_report, indent=2), encoding="utf-8")
+
+    if arguments.baseline is not None:
+        baseline_report = json.loads(arguments.baseline.read_text(encoding="utf-8"))
+        differences = environment_differences(report=suite_report, baseline=baseline_report)
+        for difference in differences:
+            print(f"ENVIRONMENT {difference}")
+        if differences and not arguments.ignore_environment:
+            print("The baseline was taken in another environment, rerun it here or pass --ignore-environment.",
+                  file=sys.stderr)
+            sys.exit(2)
+        found_regressions = compare_to_baseline(report=suite_report, baseline=baseline_report,
+                                                threshold=arguments.threshold)
+        for regression in found_regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if found_regressions else 0)
@@ -0,0 +1,42 @@
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+"""
+Measures the cold start of the package in fresh interpreters: the time to import it, and the time until the first
+date has been found (which includes compiling the date matcher).
+"""
+
+STARTUP_SNIPPET = """
+import time
+start = time.perf_counter()
+import text_mining_package
+imported = time.perf_counter()
+from text_mining_package.date_finder import DateFinderx
+DateFinderx(raw_text='03/25/93 Total time of visit (in minutes):')
+first_date = time.perf_counter()
+print(imported - start, first_date - start, 'numpy' in sys.modules)
+"""
+
+
+def measure_startup(runs: int = 20) -> dict:
+    """
+    Runs the startup snippet in new interpreters and reports median times in milliseconds.
+    :param runs: number of interpreters to start
+    :return: dictionary of median import time, median time to first date, and whether NumPy was imported.
+    """
+    import_times, first_date_times = [], []
+    numpy_loaded = False
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", "import sys\n" + STARTUP_SNIPPET], capture_output=True,
+                                text=True, check=True, cwd=Path(__file__).parent.parent).stdout.split()
+        import_times.append(float(output[0]) * 1000)
+        first_date_times.append(float(output[1]) * 1000)
+        numpy_loaded = numpy_loaded or output[2] == 'True'
+    return {'import_ms': statistics.median(import_times), 'first_date_ms': statistics.median(first_date_times),
+            'numpy_loaded': numpy_loaded}
+
+
+if __name__ == "__main__":
+    print(measure_startup())
@@ -3,7 +3,7 @@ from pathlib import Path
 
 import pandas as pd
 
-from text_mining_package.date_finder import DateFinderx
+from text_mining_package.vectorized_date_finder import extract_date_columns
 
 cumulative_match_series = pd.Series(data=None, name='match_objects', dtype=object)
 
@@ -11,6 +11,6 @@ dates_series = pd.Series(
     data=Path(r"F:\coursera_python_text_mining\dates.txt").read_text(encoding='utf-8').splitlines(),
     name='target_phrases')
 original_date_series = copy.copy(dates_series)
-extraction_series_a = pd.Series(data=original_date_series.apply(lambda x: DateFinderx(raw_text=x).pydate))
-series_as_pandas_dt = pd.to_datetime(extraction_series_a).dt.date.sort_values().index.to_series().reset_index(drop=True)
+extraction_frame = extract_date_columns(notes=original_date_series)
+series_as_pandas_dt = extraction_frame['date'].sort_values(kind='stable').index.to_series().reset_index(drop=True)
 print("Fin")
@@ -1,35 +1,76 @@
-import copy
+import argparse
+import sys
+import time
 
-from text_mining_package import DateFinder
+from text_mining_package.chronological_order import chronological_order
+from text_mining_package.date_records import iter_date_records_in_file
+from text_mining_package.date_writers import DateRecordWriter, NpyStreamWriter
 
 """
-This is the main function for the text mining project.  
-
+This is the main function for the text mining project.
+It extracts the date of every note of a note file (one note per line) and writes them in bulk to a columnar file.
+With --order, the line numbers of the notes in chronological order are written as well, which is the answer to the
+assignment.
 
+    python main.py dates.txt dates.npz --order order.npy --workers 4
 """
-if __name__ == "__main__":
 
-    # ~~~~~~~~~~~~~~~~~~~~~~~~
-    # read in the source file
-    # ~~~~~~~~~~~~~~~~~~~~~~~~
-    doc = []
-    with open(r'.\dates.txt') as file:
-        for line in file:
-            doc.append(line)
-
-    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-    # Run the primary class and create a tuple where the first number is sequential and the 2nd number is text
-    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-    pre_sorted_results = []
-    for line_counter, line_text in enumerate(doc):
-        try:
-            pre_sorted_results.append((line_counter, DateFinder(raw_string=line_text).convert_to_python_datetime()))
-        except ValueError as uhoh:
-            print(f"{uhoh}")
-
-    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-    # sort on the date to get the value
-    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-    sorted_results = copy.deepcopy(pre_sorted_results)
-    sorted_results.sort(key=lambda x: x[1])
-    final_results = [x[0] for x in sorted_results]
+
+def parse_arguments(arguments: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Extract the date of every note in a note file.")
+    parser.add_argument("input", help="note file, one note per line")
+    parser.add_argument("output", help="output file: .npy, .npz, .csv or .parquet")
+    parser.add_argument("--format", choices=DateRecordWriter.formats, help="output format, default from the suffix")
+    parser.add_argument("--order", help=".npy file for the line numbers in chronological order")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes, 1 runs in this process")
+    parser.add_argument("--chunk-bytes", type=int, default=1 << 24, help="bytes of the note file per chunk")
+    parser.add_argument("--encoding", default="utf-8", help="text encoding of the note file")
+    return parser.parse_args(arguments)
+
+
+def extract_dates(input_path: str, output_path: str, output_format: str = None, order_path: str = None,
+                  workers: int = 1, chunk_bytes: int = 1 << 24, encoding: str = "utf-8") -> dict:
+    """
+    The purpose of this function is to run the whole pipeline: memory mapped chunks of the note file go through the
+    workers, each chunk of date records is written straight to the output, and optionally ordered chronologically.
+    Notes without a date are counted rather than reported one by one.
+    :return: dictionary of counts: lines, dated, no_date (no pattern matched) and invalid (not a real date)
+    """
+    counts = {'lines': 0, 'dated': 0, 'no_date': 0, 'invalid': 0}
+
+    with DateRecordWriter(path=output_path, output_format=output_format) as writer:
+        def written_records():
+            for records in iter_date_records_in_file(path=input_path, workers=workers, chunk_bytes=chunk_bytes,
+                                                     encoding=encoding):
+                writer.write(records)
+                found = records['pattern'] >= 0
+                counts['lines'] += len(records)
+                counts['dated'] += int(records['valid'].sum())
+                counts['no_date'] += int((~found).sum())
+                counts['invalid'] += int((found & ~records['valid']).sum())
+                yield records
+
+        if order_path is None:
+            for _ in written_records():
+                pass
+        else:
+            order_writer = NpyStreamWriter()
+            for lines in chronological_order(record_chunks=written_records()):
+                order_writer.write(lines)
+            with open(order_path, "wb") as order_file:
+                order_writer.close(file=order_file)
+    return counts
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    start = time.perf_counter()
+    try:
+        run_counts = extract_dates(input_path=arguments.input, output_path=arguments.output,
+                                   output_format=arguments.format, order_path=arguments.order,
+                                   workers=arguments.workers, chunk_bytes=arguments.chunk_bytes,
+                                   encoding=arguments.encoding)
+    except (OSError, ImportError, ValueError) as uhoh:
+        sys.exit(f"{uhoh}")
+    print(f"{run_counts['lines']} lines, {run_counts['dated']} dated, {run_counts['no_date']} without a date, "
+          f"{run_counts['invalid']} invalid dates in {time.perf_counter() - start:.2f} s", file=sys.stderr)
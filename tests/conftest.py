@@ -0,0 +1,44 @@
+from functools import lru_cache
+from pathlib import Path
+
+import pytest
+
+from text_mining_package.batch_date_finder import find_date
+
+repository = Path(__file__).parent.parent
+
+
+@lru_cache(maxsize=1)
+def read_dates_text() -> tuple:
+    """
+    The purpose of this function is to read the lines of dates.txt once for the whole test run, since
+    pytest_generate_tests needs them before any fixture exists.
+    :return: tuple of the note lines
+    """
+    return tuple((repository / "dates.txt").read_text(encoding="utf-8").splitlines())
+
+
+def pytest_generate_tests(metafunc):
+    # ~~~~ A test taking dates_line runs once per line of dates.txt and once per line of its module's extra_test_lines.
+    if "dates_line" in metafunc.fixturenames:
+        metafunc.parametrize("dates_line", read_dates_text() + tuple(getattr(metafunc.module, "extra_test_lines", ())))
+
+
+@pytest.fixture(scope="session")
+def dates_path() -> Path:
+    return repository / "dates.txt"
+
+
+@pytest.fixture(scope="session")
+def dates_bytes(dates_path) -> bytes:
+    return dates_path.read_bytes()
+
+
+@pytest.fixture(scope="session")
+def dates_text() -> list:
+    return list(read_dates_text())
+
+
+@pytest.fixture(scope="session")
+def expected_dates(dates_text) -> list:
+    return [find_date(raw_text=raw_text) for raw_text in dates_text]
@@ -0,0 +1,31 @@
+import pytest
+
+from text_mining_package import find_dates
+from text_mining_package.batch_date_finder import find_date
+from text_mining_package.date_finder import DateFinderx
+
+
+@pytest.mark.parametrize("workers, chunksize", [(1, 1024), (2, 7), (3, 1000)])
+def test_find_dates_keeps_input_order(workers, chunksize, dates_text, expected_dates):
+    assert list(find_dates(iter(dates_text), workers=workers, chunksize=chunksize)) == expected_dates
+
+
+def test_find_dates_no_date_is_none():
+    assert list(find_dates(["no date here", "4/20/99"])) == [None, find_date("4/20/99")]
+
+
+def date_finder_date(raw_text: str = str()):
+    try:
+        return DateFinderx(raw_text=raw_text).pydate
+    except (AttributeError, TypeError):
+        return None
+
+
+def test_find_date_agrees_with_date_finder(dates_text):
+    for raw_text in dates_text + ["no date here", "2/30/99", "13/2009", "2 CPT 1992", "Mar 21st, 2009"]:
+        assert find_date(raw_text=raw_text) == date_finder_date(raw_text=raw_text)
+
+
+def test_invalid_dates_are_quiet(capfd):
+    assert list(find_dates(["2/30/99", "4/31/1990", "2 CPT 1992"], workers=2, chunksize=1)) == [None, None, None]
+    assert capfd.readouterr().out == ""
@@ -0,0 +1,39 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from text_mining_package.batch_date_finder import find_date
+from text_mining_package.chronological_order import chronological_order, key_dates, sort_keys
+from text_mining_package.date_records import find_date_records, iter_date_records_in_file
+
+extra_test_lines = ["no date here", "4/20/99", "2/30/99", "4/20/99", "Jan 1 1901"]
+
+
+def expected_order(dates: list, keep_undated: bool = True) -> list:
+    dated = sorted((date, line) for line, date in enumerate(dates) if date is not None)
+    undated = [line for line, date in enumerate(dates) if date is None] if keep_undated else []
+    return [line for _, line in dated] + undated
+
+
+@pytest.mark.parametrize("run_size, block_size", [(1 << 22, 1 << 16), (97, 5), (10, 1000)])
+@pytest.mark.parametrize("keep_undated", [True, False])
+def test_chronological_order_matches_sorted_dates(run_size, block_size, keep_undated, dates_text, expected_dates):
+    records = find_date_records(dates_text + extra_test_lines)
+    chunks = np.array_split(records, 7)
+    lines = np.concatenate(list(chronological_order(chunks, keep_undated=keep_undated, run_size=run_size,
+                                                    block_size=block_size)))
+    dates = expected_dates + [find_date(raw_text=raw_text) for raw_text in extra_test_lines]
+    assert lines.tolist() == expected_order(dates, keep_undated=keep_undated)
+
+
+def test_chronological_order_of_file(dates_path, expected_dates):
+    lines = np.concatenate(list(chronological_order(iter_date_records_in_file(dates_path, chunk_bytes=4096),
+                                                    run_size=64)))
+    assert lines.tolist() == expected_order(expected_dates)
+
+
+def test_keys_hold_dates():
+    keys = np.sort(sort_keys(find_date_records(["4/20/99", "no date", "Jan 1 1901"])))
+    assert key_dates(keys)[:2].tolist() == [datetime.date(1901, 1, 1), datetime.date(1999, 4, 20)]
+    assert np.isnat(key_dates(keys)[2])
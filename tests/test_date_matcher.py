@@ -0,0 +1,92 @@
+import re
+
+import pytest
+
+from text_mining_package import DateCaptureRegex, DateMatcher, NicDate
+
+extra_test_lines = ["5 12/25/1990", "12/25/1990 and 13/40/1991", "10 feb 1990 jan 1991", "1920201 and 1990",
+                    "March 4 1990 or 12 Jan 1991", "Dec 1999 Jan 1999", "no date here", ""]
+
+
+def sequential_search(search_text: str = str()):
+    """
+    Reference implementation: the pattern by pattern scan the matcher replaces.
+    """
+    for dcr in DateCaptureRegex.create_date_regex():
+        results = tuple(re.finditer(pattern=dcr, string=search_text))
+        if len(results) == 1:
+            return results[0].groupdict()
+        if len(results) > 1:
+            validity_results = [(result, NicDate().valid_date(in_match_result=result)) for result in results]
+            return sorted(validity_results, key=lambda x: x[1], reverse=True)[0][0].groupdict()
+
+
+def test_matcher_agrees_with_sequential_scan(dates_line):
+    assert DateMatcher.default_matcher().search(search_text=dates_line) == sequential_search(search_text=dates_line)
+
+
+def test_families_collapse_pattern_count():
+    assert len(DateCaptureRegex.create_date_regex_families()) < len(DateCaptureRegex.create_date_regex()) / 10
+
+
+def test_candidates_include_best_pick(dates_line):
+    candidates = DateMatcher.default_matcher().find_candidates(search_text=dates_line)
+    best = [candidate for candidate in candidates if candidate.best]
+    result_dict = DateMatcher.default_matcher().search(search_text=dates_line)
+    if result_dict is None:
+        assert candidates == []
+        return
+    assert len(best) == 1
+    assert (best[0].month, best[0].day, best[0].year) == tuple(result_dict.get(key) for key in ('month', 'day', 'year'))
+    spans = [(candidate.start, candidate.end) for candidate in candidates]
+    assert spans == sorted(spans)
+    assert all(end <= next_start for (_, end), (next_start, _) in zip(spans, spans[1:]))
+
+
+def test_bytes_matcher_agrees_with_str_matcher(dates_line):
+    str_candidates = DateMatcher.default_matcher().find_candidates(search_text=dates_line)
+    bytes_candidates = DateMatcher.default_bytes_matcher().find_candidates(search_text=dates_line.encode("ascii"))
+    assert [(candidate.start, candidate.end, candidate.pattern, candidate.score, candidate.best, candidate.month,
+             candidate.day, candidate.year) for candidate in str_candidates] == [
+        (candidate.start, candidate.end, candidate.pattern, candidate.score, candidate.best,
+         *(None if part is None else part.decode("ascii") for part in (candidate.month, candidate.day, candidate.year)))
+        for candidate in bytes_candidates]
+
+
+def test_candidates_every_date():
+    candidates = DateMatcher.default_matcher().find_candidates(search_text="12/25/1990 seen again Jan 5 1991 and 1995")
+    assert [(candidate.year, candidate.score, candidate.best) for candidate in candidates] == [
+        ('1990', 8, True), ('1991', 8, False), ('1995', 8, False)]
+
+
+@pytest.mark.parametrize("search_text, scanned", [("no digits at all", False), ("4/20/99", True), ("Total: 3 x", True)])
+def test_prefilter_skips_hopeless_lines(search_text, scanned):
+    scanner, _ = DateMatcher.default_matcher().prefilter(search_text=search_text)
+    assert (scanner is not None) == scanned
+
+
+def test_prefilter_drops_month_families_without_month_names():
+    _, scanner_families = DateMatcher.default_matcher().prefilter(search_text="4/20/99")
+    rankings = [DateCaptureRegex.create_date_regex_families()[index][1] for index in scanner_families]
+    assert "month" not in rankings
+
+
+def test_stats_are_off_by_default():
+    assert DateMatcher().stats_snapshot() is None
+
+
+def test_stats_keep_results(dates_text):
+    matcher = DateMatcher()
+    matcher.enable_stats()
+    for search_text in dates_text + extra_test_lines:
+        assert matcher.search(search_text=search_text) == DateMatcher.default_matcher().search(search_text=search_text)
+
+    snapshot = matcher.stats_snapshot()
+    assert snapshot['lines'] == len(dates_text + extra_test_lines)
+    assert sum(family['wins'] for family in snapshot['families']) == snapshot['lines'] - sum(
+        DateMatcher.default_matcher().search(search_text=search_text) is None
+        for search_text in dates_text + extra_test_lines)
+    assert all(family['hits'] <= family['attempts'] for family in snapshot['families'])
+    assert [family['name'] for family in snapshot['families']][:2] == ['a', 'b']
+    matcher.disable_stats()
+    assert matcher.stats_snapshot() is None
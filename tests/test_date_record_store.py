@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from text_mining_package import date_record_store
+from text_mining_package.date_record_store import load_date_store, read_manifest, update_date_store
+from text_mining_package.date_records import find_date_records
+
+
+@pytest.fixture(scope="module")
+def dates_lines(dates_bytes) -> list:
+    return dates_bytes.splitlines(keepends=True)
+
+
+def full_run(tmp_path: Path, data: bytes) -> bytes:
+    (tmp_path / "full.txt").write_bytes(data)
+    update_date_store(path=tmp_path / "full.txt", store_path=tmp_path / "full.records")
+    return (tmp_path / "full.records").read_bytes()
+
+
+@pytest.mark.parametrize("cuts", [(100,), (1, 250, 251, 499)])
+def test_appended_runs_match_full_run(tmp_path, cuts, dates_bytes, dates_lines, dates_text):
+    note_path, store_path = tmp_path / "notes.txt", tmp_path / "notes.records"
+    note_path.write_bytes(b"")
+    for start, end in zip((0,) + cuts, cuts + (len(dates_lines),)):
+        with open(note_path, "ab") as file:
+            file.write(b"".join(dates_lines[start:end]))
+        manifest = update_date_store(path=note_path, store_path=store_path, chunk_bytes=2048)
+        assert manifest['lines'] == end
+    assert store_path.read_bytes() == full_run(tmp_path=tmp_path, data=dates_bytes)
+    records = load_date_store(store_path=store_path)
+    assert np.array_equal(records, find_date_records(dates_text))
+
+
+def test_unfinished_line_waits(tmp_path):
+    note_path, store_path = tmp_path / "notes.txt", tmp_path / "notes.records"
+    note_path.write_bytes(b"4/20/99 first\nsecond 5/1")
+    assert update_date_store(path=note_path, store_path=store_path)['lines'] == 1
+    with open(note_path, "ab") as file:
+        file.write(b"/2001\n")
+    assert update_date_store(path=note_path, store_path=store_path)['lines'] == 2
+    assert load_date_store(store_path=store_path)['year'].tolist() == [1999, 2001]
+
+
+def test_interrupted_run_resumes(tmp_path, dates_bytes, dates_lines):
+    note_path, store_path = tmp_path / "notes.txt", tmp_path / "notes.records"
+    note_path.write_bytes(b"".join(dates_lines[:200]))
+    update_date_store(path=note_path, store_path=store_path)
+    with open(store_path, "ab") as store:
+        store.write(b"\xff" * 50)
+    note_path.write_bytes(dates_bytes)
+    update_date_store(path=note_path, store_path=store_path, chunk_bytes=4096)
+    assert store_path.read_bytes() == full_run(tmp_path=tmp_path, data=dates_bytes)
+
+
+def test_interrupted_rebuild_keeps_store_and_manifest_in_step(tmp_path, monkeypatch, dates_lines):
+    note_path, store_path = tmp_path / "notes.txt", tmp_path / "notes.records"
+    note_path.write_bytes(b"".join(dates_lines[:300]))
+    update_date_store(path=note_path, store_path=store_path)
+    note_path.write_bytes(b"".join(dates_lines[250:]))
+
+    def interrupted_chunk(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as patch:
+        patch.setattr(date_record_store, "date_records_from_file_chunk", interrupted_chunk)
+        with pytest.raises(KeyboardInterrupt):
+            update_date_store(path=note_path, store_path=store_path)
+    assert read_manifest(store_path=store_path)['lines'] == 0
+    assert len(load_date_store(store_path=store_path)) == 0
+    update_date_store(path=note_path, store_path=store_path)
+    assert store_path.read_bytes() == full_run(tmp_path=tmp_path, data=b"".join(dates_lines[250:]))
+
+
+def test_short_store_is_rejected(tmp_path, dates_lines):
+    note_path, store_path = tmp_path / "notes.txt", tmp_path / "notes.records"
+    note_path.write_bytes(b"".join(dates_lines[:100]))
+    update_date_store(path=note_path, store_path=store_path)
+    store_path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        load_date_store(store_path=store_path)
+
+
+@pytest.mark.parametrize("store_bytes", [None, 40])
+def test_missing_or_short_store_is_rebuilt(tmp_path, store_bytes, dates_lines):
+    note_path, store_path = tmp_path / "notes.txt", tmp_path / "notes.records"
+    notes = b"".join(dates_lines[:50])
+    note_path.write_bytes(notes)
+    update_date_store(path=note_path, store_path=store_path)
+    if store_bytes is None:
+        store_path.unlink()
+    else:
+        store_path.write_bytes(store_path.read_bytes()[:store_bytes])
+    assert update_date_store(path=note_path, store_path=store_path)['lines'] == 50
+    assert store_path.read_bytes() == full_run(tmp_path=tmp_path, data=notes)
+
+
+def test_rewritten_file_is_rebuilt(tmp_path, dates_lines):
+    note_path, store_path = tmp_path / "notes.txt", tmp_path / "notes.records"
+    note_path.write_bytes(b"".join(dates_lines[:300]))
+    update_date_store(path=note_path, store_path=store_path)
+    rewritten = b"".join(dates_lines[250:])
+    note_path.write_bytes(rewritten)
+    update_date_store(path=note_path, store_path=store_path)
+    assert read_manifest(store_path=store_path)['offset'] == len(rewritten)
+    assert store_path.read_bytes() == full_run(tmp_path=tmp_path, data=rewritten)
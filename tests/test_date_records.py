@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from text_mining_package import NicDate
+from text_mining_package.batch_date_finder import find_date
+from text_mining_package.date_finder import DateFinderx
+from text_mining_package.date_records import DATE_RECORD_DTYPE, find_date_records, iter_date_records_in_file
+from text_mining_package.file_date_finder import ascii_compatible
+
+extra_test_lines = ["no date here", "2/30/99", "13/2009", "95 and 1990", "Mar 21 2009"]
+
+
+@pytest.fixture(scope="module")
+def record_test_lines(dates_text) -> list:
+    return dates_text + extra_test_lines
+
+
+def assert_records_match_date_finder(records: np.ndarray, lines: list, dates: list):
+    assert records.dtype == DATE_RECORD_DTYPE
+    assert records['line'].tolist() == list(range(len(lines)))
+    for record, raw_text, date in zip(records, lines, dates):
+        assert bool(record['valid']) == (date is not None)
+        if date is not None:
+            assert (record['year'], record['month'], record['day']) == (date.year, date.month, date.day)
+            cleaned_text = DateFinderx.clean_text(raw_text=raw_text)
+            assert str(date.year)[-2:] in cleaned_text[record['start']:record['end']]
+
+
+@pytest.mark.parametrize("workers, chunksize", [(1, 65536), (2, 33)])
+def test_records_match_date_finder(workers, chunksize, record_test_lines, expected_dates):
+    records = find_date_records(record_test_lines, workers=workers, chunksize=chunksize)
+    dates = expected_dates + [find_date(raw_text=raw_text) for raw_text in extra_test_lines]
+    assert_records_match_date_finder(records=records, lines=record_test_lines, dates=dates)
+
+
+def test_no_date_record():
+    record = find_date_records(["no date here"])[0]
+    assert (record['pattern'], record['start'], record['end'], record['valid']) == (-1, -1, -1, False)
+
+
+def test_file_records_match_date_finder(dates_path, dates_text, expected_dates):
+    records = np.concatenate(list(iter_date_records_in_file(dates_path, chunk_bytes=4096)))
+    assert_records_match_date_finder(records=records, lines=dates_text, dates=expected_dates)
+
+
+def test_bytes_records_match_str_records(record_test_lines):
+    lines = record_test_lines + ["caf\xe9 4/5/1990", "\x1c2nd\x1d 3/4/91", "Janaury 5 1990", ""]
+    byte_lines = [line.encode("utf-8") for line in lines] + [b"bad \xff 3/4/1990"]
+    assert np.array_equal(find_date_records(byte_lines), find_date_records(lines + ["bad \ufffd 3/4/1990"]))
+
+
+def test_latin_1_file_records(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_bytes("caf\xe9 4/5/1990\n12 Janv 1991\n".encode("latin-1"))
+    records = np.concatenate(list(iter_date_records_in_file(path, encoding="latin-1")))
+    assert np.array_equal(records, find_date_records(["caf\xe9 4/5/1990", "12 Janv 1991"]))
+    assert ascii_compatible(encoding="latin-1") and not ascii_compatible(encoding="utf-16")
+
+
+@pytest.mark.parametrize("result_dict, parts", [
+    ({'year': '99'}, (1999, 1, 1)), ({'year': '2009', 'month': '13'}, (2009, 1, 1)),
+    ({'year': '1990', 'month': 'Sep', 'day': '5'}, (1990, 9, 5)),
+    ({'year': b'85', 'month': b'june', 'day': None}, (1985, 6, 1)), ({'year': '1990', 'month': 'CPT'}, (1990, 0, 1))])
+def test_date_parts_rules(result_dict, parts):
+    assert NicDate.date_parts(result_dict=result_dict) == parts
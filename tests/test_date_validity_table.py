@@ -0,0 +1,30 @@
+import math
+
+import pytest
+
+from text_mining_package import NicDate
+from text_mining_package.date_validity_table import DateValidityTable
+
+score_test_results = [({'year': '2000', 'month': '2', 'day': '29'}, 8),
+                      ({'year': '1900', 'month': '2', 'day': '29'}, 0),
+                      ({'year': '99', 'month': '2', 'day': '29'}, 4), ({'year': '96', 'month': '02', 'day': '29'}, 8),
+                      ({'year': '1990', 'month': '1', 'day': '31'}, 8),
+                      ({'year': '1990', 'month': '4', 'day': '31'}, 4),
+                      ({'year': '1990', 'month': '13', 'day': '1'}, 1), ({'year': '2030', 'month': '1', 'day': '1'}, 0),
+                      ({'year': '1990', 'month': 'March'}, 8), ({'year': '1990', 'month': 'abc'}, 1),
+                      ({'year': '1990'}, 8), ({'year': '00', 'month': '1', 'day': '1'}, 0)]
+
+
+@pytest.mark.parametrize("group_dict, score", score_test_results)
+def test_single_scores(group_dict, score):
+    assert DateValidityTable.default_table().score_group_dict(group_dict=group_dict) == score
+
+
+@pytest.mark.parametrize("month, year, largest_day", [(2, 2000, 29), (2, 1900, 28), (2, 1996, 29), (2, 1999, 28),
+                                                      (2, None, 29), (4, 1999, 30)])
+def test_find_largest_day_leap_years(month, year, largest_day):
+    assert NicDate.find_largest_day(result_month=month, result_year=year) == largest_day
+
+
+def test_find_largest_day_of_no_month():
+    assert math.isnan(NicDate.find_largest_day(result_month=13, result_year=1999))
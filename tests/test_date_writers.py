@@ -0,0 +1,70 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from text_mining_package.chronological_order import chronological_order
+from text_mining_package.date_records import find_date_records
+from text_mining_package.date_writers import OUTPUT_COLUMNS, DateRecordWriter
+
+repository = Path(__file__).parent.parent
+
+
+@pytest.fixture(scope="module")
+def writer_test_lines(dates_text) -> list:
+    return dates_text + ["no date here", "2/30/99"]
+
+
+def write_records(path: Path, records: np.ndarray, chunks: int = 3) -> Path:
+    with DateRecordWriter(path=path) as writer:
+        for chunk in np.array_split(records, chunks):
+            writer.write(chunk)
+    return path
+
+
+@pytest.mark.parametrize("chunks", [1, 4])
+def test_npy_and_npz_round_trip(tmp_path, chunks, writer_test_lines):
+    records = find_date_records(writer_test_lines)
+    assert np.array_equal(np.load(write_records(path=tmp_path / "dates.npy", records=records, chunks=chunks)),
+                          records)
+    with np.load(write_records(path=tmp_path / "dates.npz", records=records, chunks=chunks)) as columns:
+        assert sorted(columns.files) == sorted(OUTPUT_COLUMNS)
+        for column in OUTPUT_COLUMNS:
+            assert np.array_equal(columns[column], records[column])
+
+
+def test_csv_round_trip(tmp_path, writer_test_lines):
+    records = find_date_records(writer_test_lines)
+    path = write_records(path=tmp_path / "dates.csv", records=records)
+    assert path.read_text(encoding="ascii").splitlines()[0] == ",".join(OUTPUT_COLUMNS)
+    table = np.loadtxt(path, delimiter=",", skiprows=1, dtype=np.int64)
+    for index, column in enumerate(OUTPUT_COLUMNS):
+        assert table[:, index].tolist() == records[column].astype(np.int64).tolist()
+
+
+def test_parquet_round_trip(tmp_path, writer_test_lines):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    records = find_date_records(writer_test_lines)
+    table = parquet.read_table(write_records(path=tmp_path / "dates.parquet", records=records))
+    for column in OUTPUT_COLUMNS:
+        assert table.column(column).to_numpy().tolist() == records[column].tolist()
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        DateRecordWriter(path="dates.txt")
+
+
+def test_main_writes_dates_and_order(tmp_path, dates_path, dates_text):
+    completed = subprocess.run([sys.executable, str(repository / "main.py"), str(dates_path),
+                                str(tmp_path / "dates.npz"), "--order", str(tmp_path / "order.npy"),
+                                "--chunk-bytes", "4096"], capture_output=True, text=True, cwd=tmp_path)
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout == ""
+    assert f"{len(dates_text)} lines" in completed.stderr
+    records = find_date_records(dates_text)
+    with np.load(tmp_path / "dates.npz") as columns:
+        assert np.array_equal(columns['year'], records['year'])
+    assert np.array_equal(np.load(tmp_path / "order.npy"), np.concatenate(list(chronological_order([records]))))
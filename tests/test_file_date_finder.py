@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from text_mining_package import find_dates_in_file
+from text_mining_package.batch_date_finder import find_date
+from text_mining_package.date_records import iter_date_records_in_file
+
+
+@pytest.mark.parametrize("workers, chunk_bytes", [(1, 1 << 24), (1, 1), (2, 997)])
+def test_file_records_match_lines(workers, chunk_bytes, dates_path, dates_bytes, dates_text, expected_dates):
+    records = list(find_dates_in_file(dates_path, workers=workers, chunk_bytes=chunk_bytes))
+    assert [line_number for line_number, _, _ in records] == list(range(len(dates_text)))
+    assert [date for _, _, date in records] == expected_dates
+    for line_number, byte_offset, _ in records:
+        assert dates_bytes[byte_offset:].decode("utf-8").startswith(dates_text[line_number])
+
+
+def test_empty_and_unterminated_files(tmp_path):
+    empty_path = tmp_path / "empty.txt"
+    empty_path.write_bytes(b"")
+    assert list(find_dates_in_file(empty_path)) == []
+    notes_path = tmp_path / "notes.txt"
+    notes_path.write_bytes(b"no date\r\n4/20/99")
+    assert list(find_dates_in_file(notes_path)) == [(0, 0, None), (1, 9, find_date("4/20/99"))]
+
+
+def test_lines_end_at_newline_only(tmp_path):
+    notes_path = tmp_path / "notes.txt"
+    notes_path.write_bytes(b"seen\r4/20/99\nnext\x0b\x1c5/1/2001\r\n\n")
+    assert list(find_dates_in_file(notes_path, chunk_bytes=1)) == [(0, 0, find_date("seen\r4/20/99")),
+                                                                   (1, 13, find_date("5/1/2001")), (2, 29, None)]
+    records = np.concatenate(list(iter_date_records_in_file(notes_path)))
+    assert records['year'].tolist() == [1999, 2001, 0]
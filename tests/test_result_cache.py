@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from text_mining_package import ResultCache, find_dates
+from text_mining_package.batch_date_finder import find_date
+from text_mining_package.date_records import find_date_records
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResultCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", None)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("b", ResultCache.missing) is ResultCache.missing
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 1, 'size': 2, 'maxsize': 2}
+
+
+def test_cache_keys_on_cleaned_line():
+    cache = ResultCache()
+    assert find_date(raw_text="seen on 4/20/99.", cache=cache) == find_date(raw_text="seen  on 4/20/99", cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.parametrize("workers, chunksize, maxsize", [(1, 64, 65536), (2, 100, 65536), (1, 10, 5)])
+def test_find_dates_with_cache_keeps_results(workers, chunksize, maxsize, dates_text, expected_dates):
+    notes = dates_text * 2
+    cache = ResultCache(maxsize=maxsize)
+    assert list(find_dates(iter(notes), workers=workers, chunksize=chunksize, cache=cache)) == expected_dates * 2
+    assert cache.hits + cache.misses == len(notes)
+    assert len(cache) <= maxsize
+
+
+def test_find_date_records_with_cache_keeps_results(dates_text):
+    notes = dates_text * 2
+    cache = ResultCache()
+    assert np.array_equal(find_date_records(notes, chunksize=100, cache=cache), find_date_records(notes, chunksize=100))
+    assert cache.hits >= len(dates_text)
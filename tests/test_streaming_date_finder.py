@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from text_mining_package.streaming_date_finder import create_executor, start_date_server, stream_dates
+
+
+async def collect(notes, **kwargs) -> list:
+    return [date async for date in stream_dates(notes=notes, **kwargs)]
+
+
+async def slow_feed(notes: list, pause: float = 0.001):
+    for note in notes:
+        await asyncio.sleep(pause)
+        yield note
+
+
+@pytest.mark.parametrize("workers, batch_size", [(1, 256), (1, 1), (2, 17)])
+def test_stream_dates_keeps_feed_order(workers, batch_size, dates_text, expected_dates):
+    assert asyncio.run(collect(dates_text, workers=workers, batch_size=batch_size)) == expected_dates
+
+
+def test_stream_dates_closes_batches_on_deadline(dates_text, expected_dates):
+    dates = asyncio.run(collect(slow_feed(dates_text[:20]), batch_size=1000, max_delay=0.0005))
+    assert dates == expected_dates[:20]
+
+
+def test_stream_dates_raises_feed_errors():
+    async def broken_feed():
+        yield "4/20/99"
+        raise RuntimeError("feed broke")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(collect(broken_feed()))
+
+
+def test_date_server_round_trip(dates_text, expected_dates):
+    notes = dates_text[:50] + ["no date here"]
+
+    async def round_trip():
+        executor = create_executor(workers=1)
+        server = await start_date_server(executor=executor, port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection(host="127.0.0.1", port=port)
+        writer.write("".join(note + "\n" for note in notes).encode("utf-8"))
+        writer.write_eof()
+        replies = (await reader.read()).decode("ascii").splitlines()
+        server.close()
+        await server.wait_closed()
+        executor.shutdown()
+        return replies
+
+    dates = expected_dates[:50] + [None]
+    assert asyncio.run(round_trip()) == [date.isoformat() if date is not None else "" for date in dates]
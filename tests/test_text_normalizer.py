@@ -0,0 +1,92 @@
+import re
+
+import pytest
+
+from text_mining_package.batch_date_finder import find_date
+from text_mining_package.date_finder import DateFinderx
+from text_mining_package.nic_date_date_class import NicDate
+from text_mining_package.text_normalizer import normalize_text, normalize_text_with_offsets, original_span
+
+extra_test_lines = ["  Mar 21st,\t2009 ", "the 4TH of July 1990", "1st2nd 3rd", "\x1c2nd\x1d", "", " . ",
+                    "caf\xe9  on 22nd Jan\xa0\xa01990", "Sept. 9th, Augusta", "caf\xe9 Agust", "visit on 4th day 1990",
+                    "the 2nd CPT 1992 code", "21st Mar 2009", "Mar 1st 2nd Apr", "x-mar 3rd", "123rd Mar"]
+
+
+def reference_normalize(raw_text: str) -> str:
+    """
+    The same normalization written as separate regex passes.
+    """
+    cleaned_text = re.sub(pattern=r"\s+", repl=" ", string=re.sub(pattern=r"[.,;:]", repl="", string=raw_text))
+    cleaned_text = cleaned_text.strip()
+    month_words = set(NicDate.month_conversion_dict()) | set(NicDate.month_typo_dict())
+
+    def next_to_month(number):
+        before = re.search(pattern=r"\b([A-Za-z]+) $", string=cleaned_text[:number.start()])
+        after = re.match(pattern=r" ([A-Za-z]+)\b", string=cleaned_text[number.end():])
+        return any(word is not None and word.group(1).lower() in month_words for word in (before, after))
+
+    cleaned_text = re.sub(pattern=r"\b([0-9]{1,2})(?:st|nd|rd|th)\b", string=cleaned_text, flags=re.IGNORECASE,
+                          repl=lambda number: number.group(1) if next_to_month(number) else number.group())
+    return re.sub(pattern=r"[A-Za-z]+", string=cleaned_text,
+                  repl=lambda word: NicDate.month_typo_dict().get(word.group().lower(), word.group()))
+
+
+def test_normalize_text_matches_reference(dates_line):
+    assert normalize_text(raw_text=dates_line) == reference_normalize(raw_text=dates_line)
+    if dates_line.isascii():
+        assert normalize_text(raw_text=dates_line.encode("ascii")) == normalize_text(
+            raw_text=dates_line).encode("ascii")
+
+
+def test_offsets_point_into_raw_text(dates_line):
+    normalized_text, offsets = normalize_text_with_offsets(raw_text=dates_line)
+    assert normalized_text == normalize_text(raw_text=dates_line)
+    assert len(offsets) == len(normalized_text)
+    assert offsets == sorted(offsets)
+    # Letters of a corrected month name point at the letters of the misspelling.
+    assert all(dates_line[offset] == character or (character == " " and dates_line[offset].isspace())
+               or (character.isalpha() and dates_line[offset].isalpha())
+               for offset, character in zip(offsets, normalized_text))
+    if dates_line.isascii():
+        assert normalize_text_with_offsets(raw_text=dates_line.encode("ascii")) == (normalized_text.encode("ascii"),
+                                                                                    offsets)
+
+
+@pytest.mark.parametrize("raw_text, expected", [("Mar 21st, 2009", "2009-03-21"), ("21st Mar 2009", "2009-03-21"),
+                                                ("the 4TH of July 1990", "1990-07-01"),
+                                                ("visit on 4th day 1990", "1990-01-01"),
+                                                ("the 2nd CPT 1992 code", "1992-01-01")])
+def test_ordinal_suffixes_give_dates(raw_text, expected):
+    # Only the suffix of a day next to a month name goes, "4th day 1990" is no day, month and year.
+    assert str(find_date(raw_text=raw_text)) == expected
+    assert str(DateFinderx(raw_text=raw_text).pydate) == expected
+
+
+def test_candidate_spans_are_on_raw_text():
+    raw_text = "Seen  on Mar. 21st, 2009; again 4/20/99."
+    spans = [raw_text[candidate.start:candidate.end] for candidate in DateFinderx.find_candidates(raw_text=raw_text)]
+    assert spans == ["Mar. 21st, 2009", "4/20/99"]
+    assert original_span(offsets=[], start=0, end=0) == (0, 0)
+
+
+@pytest.mark.parametrize("raw_text, expected", [("Janaury 5 1990", "1990-01-05"), ("Sept 1999", "1999-09-01"),
+                                                ("seen 5 Sept. 1999", "1999-09-05"), ("Ocotber 3, 2001", "2001-10-03"),
+                                                ("Augusta 1990", "1990-01-01"), ("match 1990", "1990-01-01")])
+def test_misspelled_months(raw_text, expected):
+    assert str(find_date(raw_text=raw_text)) == expected
+
+
+def test_misspelled_month_spans_are_on_raw_text():
+    raw_text = "HH, Febuary 3rd, 2001."
+    assert normalize_text(raw_text=raw_text) == "HH february 3 2001"
+    spans = [raw_text[candidate.start:candidate.end] for candidate in DateFinderx.find_candidates(raw_text=raw_text)]
+    assert spans == ["Febuary 3rd, 2001"]
+
+
+def test_month_typo_dict():
+    typo_dict = NicDate.month_typo_dict()
+    assert NicDate.month_names_long()[4] == 'may'
+    assert {typo_dict['janaury'], typo_dict['lnovember'], typo_dict['mrach'], typo_dict['sept']} == {
+        'january', 'november', 'march', 'sep'}
+    assert not set(typo_dict) & set(NicDate.month_conversion_dict())
+    assert not {'match', 'marsh', 'jane', 'augusta', 'octobers'} & set(typo_dict)
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from text_mining_package import NicDate
+from text_mining_package.batch_date_finder import find_date
+from text_mining_package.vectorized_date_finder import extract_date_columns, resolve_date_parts
+
+
+def test_columns_agree_with_date_finder(dates_text, expected_dates):
+    extra_lines = ["no date here", "Jan 1990 and Jan 1991", "2/30/99", "13/2009"]
+    date_columns = extract_date_columns(notes=pd.Series(data=dates_text + extra_lines))
+    expected = expected_dates + [find_date(raw_text=raw_text) for raw_text in extra_lines]
+    assert [None if pd.isna(date) else date.date() for date in date_columns['date']] == expected
+
+
+def test_fallback_rules():
+    date_columns = extract_date_columns(notes=pd.Series(data=["6/2008", "2010", "4/20/99", "13/2009", "nothing"],
+                                                        index=list("abcde")))
+    assert date_columns[['year', 'month', 'day']].values.tolist() == [[2008, 6, 1], [2010, 1, 1], [1999, 4, 20],
+                                                                      [2009, 1, 1], [0, 0, 0]]
+    assert list(date_columns.index) == list("abcde")
+    assert pd.isna(date_columns.loc['e', 'date'])
+
+
+def test_resolved_parts_follow_date_parts():
+    result_dicts = [{'year': '99'}, {'year': '2009', 'month': '13'}, {'year': '1990', 'month': 'Sep', 'day': '5'},
+                    {'year': '85', 'month': 'june', 'day': None}, {'year': '1990', 'month': 'CPT'},
+                    {'year': '2001', 'month': '0', 'day': '31'}]
+    parts = pd.DataFrame(data=[(result_dict.get('month'), result_dict.get('day'), result_dict['year'])
+                               for result_dict in result_dicts], columns=['month', 'day', 'year'], dtype=object)
+    years, months, days = resolve_date_parts(parts=parts)
+    assert list(zip(years, months, days)) == [NicDate.date_parts(result_dict=result_dict)
+                                              for result_dict in result_dicts]
+
+
+def test_missing_notes_have_no_date():
+    date_columns = extract_date_columns(notes=pd.Series(data=["4/20/99", None, float("nan")]))
+    assert date_columns[['year', 'month', 'day']].values.tolist() == [[1999, 4, 20], [0, 0, 0], [0, 0, 0]]
+    assert date_columns['date'].isna().tolist() == [False, True, True]
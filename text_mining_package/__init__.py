@@ -1,2 +1,6 @@
 from text_mining_package.date_capture_regex import DateCaptureRegex
 from text_mining_package.nic_date_date_class import NicDate
+from text_mining_package.date_matcher import DateCandidate, DateMatcher
+from text_mining_package.result_cache import ResultCache
+from text_mining_package.batch_date_finder import find_dates
+from text_mining_package.file_date_finder import find_dates_in_file
@@ -0,0 +1,152 @@
+import collections
+import datetime
+import itertools
+import typing
+
+from text_mining_package import DateMatcher, NicDate
+from text_mining_package.date_finder import DateFinderx
+from text_mining_package.result_cache import ResultCache
+
+
+def find_date(raw_text: str = str(), cache: ResultCache = None):
+    """
+    The purpose of this function is to extract the date of a single note, returning None when no date can be built.
+    It gives the date DateFinderx would, straight from the matcher and NicDate.date_parts, without printing the
+    invalid ones.
+    :param raw_text: Raw text from which a date is to be extracted.
+    :param cache: optional ResultCache of dates by cleaned line.
+    :return: datetime.date or None
+    """
+    if cache is not None:
+        cleaned_text = DateFinderx.clean_text(raw_text=raw_text)
+        date = cache.get(cleaned_text, ResultCache.missing)
+        if date is ResultCache.missing:
+            date = find_date(raw_text=cleaned_text)
+            cache.put(cleaned_text, date)
+        return date
+    _, match = DateMatcher.default_matcher().search_match(search_text=DateFinderx.clean_text(raw_text=raw_text))
+    if match is None:
+        return None
+    year, month, day = NicDate.date_parts(result_dict=match.groupdict())
+    try:
+        return datetime.date(year=year, month=month, day=day)
+    except ValueError:
+        # Not a real date, such as 2/30/99, or a month word which is not a month name (month 0).
+        return None
+
+
+def find_dates_in_chunk(chunk: tuple = ()) -> list:
+    """
+    Worker side of find_dates. A whole chunk is sent per task so the pickling cost is paid per chunk, not per note.
+    :param chunk: tuple of note strings
+    :return: list of datetime.date or None, in the order of the chunk.
+    """
+    return [find_date(raw_text=raw_text) for raw_text in chunk]
+
+
+def init_worker():
+    """
+    Compiles the date matcher once when a worker process starts, so no task pays for it.
+    """
+    DateMatcher.default_matcher()
+
+
+def chunk_notes(notes: typing.Iterable[str], chunksize: int = 1) -> typing.Iterator[tuple]:
+    """
+    Splits an iterable of notes into tuples of at most chunksize notes, without reading ahead.
+    :param notes: iterable of note strings
+    :param chunksize: number of notes in a chunk
+    :return: iterator of tuples
+    """
+    notes = iter(notes)
+    while chunk := tuple(itertools.islice(notes, chunksize)):
+        yield chunk
+
+
+def map_in_order(function: typing.Callable, tasks: typing.Iterable, workers: int = 1) -> typing.Iterator:
+    """
+    The purpose of this function is to run function over tasks in a process pool and hand back the results in task
+    order. At most two tasks per worker are in flight, so memory stays bounded no matter how many tasks there are.
+    :param function: picklable function taking one task
+    :param tasks: iterable of picklable tasks, it is consumed lazily.
+    :param workers: number of worker processes. 1 runs in the calling process.
+    :return: iterator of the results of function, one per task.
+    """
+    # Compiled here first, so workers started by fork inherit the matcher and their initializer is a cache hit.
+    init_worker()
+    if workers <= 1:
+        for task in tasks:
+            yield function(task)
+        return
+
+    # Imported here because it pulls in multiprocessing, which single process callers never need.
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        pending = collections.deque()
+        for task in tasks:
+            pending.append(pool.submit(function, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def map_cached(function: typing.Callable, notes: typing.Iterable[str], cache: ResultCache, workers: int = 1,
+               chunksize: int = 1024) -> typing.Iterator[list]:
+    """
+    The purpose of this function is to run a chunk function only over the notes a cache has no result for.
+    Notes are cleaned and looked up in the calling process, each chunk sends its distinct misses to map_in_order, and
+    the fresh results are stored in the cache. Cleaning is idempotent, so function sees cleaned notes and gives the
+    same results it would for the raw ones.
+    :param function: picklable function taking a tuple of notes and returning one result per note
+    :param notes: iterable of note strings, it is consumed lazily.
+    :param cache: ResultCache of results by cleaned line
+    :param workers: number of worker processes. 1 runs in the calling process.
+    :param chunksize: number of notes per chunk.
+    :return: iterator of lists of results, one list per chunk of notes.
+    """
+    chunk_lookups = collections.deque()
+
+    def miss_tasks():
+        for chunk in chunk_notes(notes=notes, chunksize=chunksize):
+            keys = [DateFinderx.clean_text(raw_text=raw_text) for raw_text in chunk]
+            known = {}
+            for key in keys:
+                value = cache.get(key, ResultCache.missing)
+                if value is not ResultCache.missing:
+                    known[key] = value
+            misses = tuple(dict.fromkeys(key for key in keys if key not in known))
+            chunk_lookups.append((keys, known, misses))
+            yield misses
+
+    for miss_results in map_in_order(function=function, tasks=miss_tasks(), workers=workers):
+        keys, known, misses = chunk_lookups.popleft()
+        for key, value in zip(misses, miss_results):
+            cache.put(key, value)
+            known[key] = value
+        yield [known[key] for key in keys]
+
+
+def find_dates(notes: typing.Iterable[str], workers: int = 1, chunksize: int = 1024,
+               cache: ResultCache = None) -> typing.Iterator:
+    """
+    The purpose of this function is to extract dates from many notes at once, streaming results in input order.
+    With more than one worker the notes are split into chunks and spread over a process pool.
+    :param notes: iterable of note strings, it is consumed lazily.
+    :param workers: number of worker processes. 1 runs in the calling process.
+    :param chunksize: number of notes sent to a worker per task.
+    :param cache: optional ResultCache of dates by cleaned line, repeated lines are only matched once.
+    :return: iterator of datetime.date or None, one per note.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    if cache is None:
+        chunk_results = map_in_order(function=find_dates_in_chunk, tasks=chunk_notes(notes=notes, chunksize=chunksize),
+                                     workers=workers)
+    else:
+        chunk_results = map_cached(function=find_dates_in_chunk, notes=notes, cache=cache, workers=workers,
+                                   chunksize=chunksize)
+    for chunk_result in chunk_results:
+        yield from chunk_result
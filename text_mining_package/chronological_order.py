@@ -0,0 +1,145 @@
+import os
+import tempfile
+import typing
+
+import numpy as np
+
+from text_mining_package.date_validity_table import DateValidityTable
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Sort keys are one int64 per note: the day ordinal (days since 0001-01-01, plus one) in the high bits and the line
+# number in the low LINE_BITS bits. Keys are unique, and equal dates are ordered by line, so a plain sort is stable.
+# Notes without a valid date get UNDATED_ORDINAL, which sorts after every real date.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+LINE_BITS = 40
+LINE_MASK = (1 << LINE_BITS) - 1
+EPOCH_ORDINAL = 719163
+UNDATED_ORDINAL = (1 << (63 - LINE_BITS)) - 1
+
+
+def sort_keys(records: np.ndarray, keep_undated: bool = True) -> np.ndarray:
+    """
+    The purpose of this function is to turn date records into integer sort keys.
+    :param records: numpy array of DATE_RECORD_DTYPE
+    :param keep_undated: keep notes without a valid date, they sort last. They are dropped when False.
+    :return: numpy int64 array of keys
+    """
+    days = DateValidityTable.calendar_dates(years=records['year'], months=records['month'], days=records['day'])
+    valid = records['valid'] & ~np.isnat(days)
+    ordinals = np.where(valid, days.astype(np.int64) + EPOCH_ORDINAL, UNDATED_ORDINAL)
+    keys = (ordinals << LINE_BITS) | records['line'].astype(np.int64)
+    if not keep_undated:
+        keys = keys[valid]
+    return keys
+
+
+def key_lines(keys: np.ndarray) -> np.ndarray:
+    """
+    :param keys: sort keys
+    :return: numpy int64 array of the line numbers inside the keys
+    """
+    return keys & LINE_MASK
+
+
+def key_dates(keys: np.ndarray) -> np.ndarray:
+    """
+    :param keys: sort keys
+    :return: numpy datetime64[D] array of the dates inside the keys, NaT for undated notes.
+    """
+    ordinals = keys >> LINE_BITS
+    return np.where(ordinals == UNDATED_ORDINAL, np.datetime64('NaT', 'D'),
+                    (ordinals - EPOCH_ORDINAL).astype('datetime64[D]'))
+
+
+def spill_sorted_runs(key_chunks: typing.Iterable[np.ndarray], directory: str = str(),
+                      run_size: int = 1 << 22) -> typing.Iterator[np.ndarray]:
+    """
+    The purpose of this function is to cut a stream of keys into sorted runs of run_size keys, writing every run to
+    a .npy file in directory. When the whole stream fits in one run nothing is written.
+    :param key_chunks: iterable of int64 key arrays
+    :param directory: where the runs are written
+    :param run_size: number of keys sorted in memory at a time
+    :return: iterator of sorted runs, memory mapped when written to disk.
+    """
+    buffered = []
+    buffered_size = 0
+    run_paths = []
+
+    def write_run(keys: np.ndarray):
+        run_path = os.path.join(directory, f"run_{len(run_paths):06d}.npy")
+        np.save(run_path, np.sort(keys))
+        run_paths.append(run_path)
+
+    for keys in key_chunks:
+        buffered.append(keys)
+        buffered_size += len(keys)
+        while buffered_size >= run_size:
+            keys = np.concatenate(buffered)
+            write_run(keys[:run_size])
+            buffered = [keys[run_size:]]
+            buffered_size = len(buffered[0])
+
+    rest = np.concatenate(buffered) if buffered else np.zeros(0, dtype=np.int64)
+    if not run_paths:
+        yield np.sort(rest)
+        return
+    if len(rest):
+        write_run(rest)
+    for run_path in run_paths:
+        yield np.load(run_path, mmap_mode='r')
+
+
+def merge_runs(runs: typing.Sequence[np.ndarray], block_size: int = 1 << 16) -> typing.Iterator[np.ndarray]:
+    """
+    The purpose of this function is to merge sorted runs of unique keys, one block of each run at a time.
+    Every round reads the next block of each run. No key still unread is smaller than the smallest last key of those
+    blocks, so every buffered key up to it can be sorted and handed out.
+    :param runs: sorted int64 arrays (memory mapped is fine)
+    :param block_size: number of keys read from a run per round
+    :return: iterator of sorted int64 arrays, together the merge of all runs.
+    """
+    positions = [0] * len(runs)
+    while True:
+        blocks = [(index, run[positions[index]:positions[index] + block_size]) for index, run in enumerate(runs)
+                  if positions[index] < len(run)]
+        if not blocks:
+            return
+        if len(blocks) == 1:
+            index, block = blocks[0]
+            positions[index] += len(block)
+            yield np.array(block)
+            continue
+        threshold = min(block[-1] for _, block in blocks)
+        taken = []
+        for index, block in blocks:
+            count = int(np.searchsorted(block, threshold, side='right'))
+            taken.append(block[:count])
+            positions[index] += count
+        yield np.sort(np.concatenate(taken))
+
+
+def chronological_order(record_chunks: typing.Iterable[np.ndarray], keep_undated: bool = True,
+                        run_size: int = 1 << 22, block_size: int = 1 << 16,
+                        directory: typing.Union[str, os.PathLike] = None) -> typing.Iterator[np.ndarray]:
+    """
+    The purpose of this function is to put the notes of a corpus in chronological order without holding the corpus
+    in memory: date records become int64 keys, keys are sorted in runs of run_size which are spilled to disk, and the
+    runs are merged. Notes with the same date keep their line order.
+        chronological_order(iter_date_records_in_file(path="dates.txt"))
+    :param record_chunks: iterable of numpy arrays of DATE_RECORD_DTYPE, as made by iter_date_records or
+        iter_date_records_in_file.
+    :param keep_undated: keep notes without a valid date, after every dated one. They are dropped when False.
+    :param run_size: number of keys sorted in memory at a time
+    :param block_size: number of keys read from a run per merge round
+    :param directory: where runs are spilled, a temporary directory is made (and removed) when None.
+    :return: iterator of numpy int64 arrays of line numbers, together every note in chronological order.
+    """
+    if run_size < 1 or block_size < 1:
+        raise ValueError("run_size and block_size must be at least 1")
+
+    with tempfile.TemporaryDirectory(dir=directory) as run_directory:
+        key_chunks = (sort_keys(records=records, keep_undated=keep_undated) for records in record_chunks)
+        runs = list(spill_sorted_runs(key_chunks=key_chunks, directory=run_directory, run_size=run_size))
+        for keys in merge_runs(runs=runs, block_size=block_size):
+            yield key_lines(keys=keys)
+        del runs
@@ -1,30 +1,24 @@
 import itertools
-import random
 import re
 from functools import lru_cache
 
+from text_mining_package.nic_date_date_class import NicDate
+
 
 class DateCaptureRegex:
     """
     This is a wrapper class for the create_date_regex function.
     It has been separated into a class for future scalability of regex.
+    The builders are static and cached on the function itself, so patterns are built once per process no matter how
+    (or from which instance) they are called.
     """
 
     def __init__(self):
         pass
 
-    def __hash__(self):
-        """
-        Hash required for using lru_cache.
-        :return: int
-        """
-
-        return random.getrandbits(63)
-
-    @lru_cache(maxsize=2)
     @staticmethod
+    @lru_cache(maxsize=1)
     def create_date_regex() -> tuple:
-        from text_mining_package import NicDate
         """
         This function creates a tuple of regex patterns to be used in searching for date.
         :return: re.Pattern - regex pattern to find dates.
@@ -62,3 +56,38 @@ class DateCaptureRegex:
         regex_builder.extend([fr"(?P<year>{x})" for x in range(1900, 2050)])
         regex_tuple = tuple([re.compile(pattern=regex_build, flags=re.IGNORECASE) for regex_build in regex_builder])
         return regex_tuple
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def create_date_regex_families() -> tuple:
+        """
+        This function creates the same search space as create_date_regex, but collapsed into pattern families.
+        Month names and the 1900-2049 year range are expressed as alternations instead of one pattern per value.
+        Each family is returned with the ranking rule that reproduces the priority of the per-value patterns it
+        replaces: 'fixed' (a single pattern), 'month' (month name order) or 'year' (ascending year), with what its
+        matches start with: 'digit' or 'month' (a month name), and with a literal character its matches always contain
+        (empty when there is none besides digits and month names).
+        :return: tuple of (regex string, ranking rule, lead, required character) in priority order.
+        """
+        months = "|".join(itertools.chain(NicDate.month_names_short(), NicDate.month_names_long()))
+        years = r"19\d\d|20[0-4]\d"
+
+        family_builder = [(r"(?P<a>(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4}))", "fixed", "digit", "/"),
+                          (r"(?P<b>(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{2}))", "fixed", "digit", "/"),
+                          (r"(?P<c>(?P<month>\d{1,2})\-(?P<day>\d{1,2})\-(?P<year>\d{4}))", "fixed", "digit", "-"),
+                          (r"(?P<d>(?P<month>\d{1,2})\-(?P<day>\d{1,2})\-(?P<year>\d{2}))", "fixed", "digit", "-"),
+                          (r"(?P<e>(?P<day>\d{1,2})\s+(?P<month>[a-zA-Z]{3})\s+(?P<year>\d{4}))", "fixed", "digit", ""),
+                          (fr"(?P<f>(?P<day>\d\d)\s+(?P<month>{months})\s+(?P<year>\d\d\d\d))", "month", "digit", ""),
+                          (fr"(?P<g>(?P<day>\d)\s+(?P<month>{months})\s+(?P<year>\d\d\d\d))", "month", "digit", ""),
+                          (fr"(?P<h>(?P<day>\d)\s+(?P<month>{months})\s+(?P<year>\d\d))", "month", "digit", ""),
+                          (fr"(?P<i>(?P<day>\d\d)\s+(?P<month>{months})\s+(?P<year>\d\d))", "month", "digit", ""),
+                          (fr"(?P<j>(?P<month>{months})\s+(?P<day>\d\d)\s+(?P<year>\d\d\d\d))", "month", "month", ""),
+                          (fr"(?P<k>(?P<month>{months})\s+(?P<day>\d)\s+(?P<year>\d\d\d\d))", "month", "month", ""),
+                          (fr"(?P<m>(?P<month>{months})\s+(?P<day>\d\d)\s+(?P<year>\d\d))", "month", "month", ""),
+                          (fr"(?P<l>(?P<month>{months})\s+(?P<day>\d)\s+(?P<year>\d\d))", "month", "month", ""),
+                          (fr"(?P<o>(?P<month>{months})\s+(?P<year>\d\d\d\d))", "month", "month", ""),
+                          (fr"(?P<n>(?P<month>{months})\s+(?P<year>\d\d))", "month", "month", ""),
+                          (r"(?P<p>(?P<month>\d{1,2})[\s+/](?P<year>\d{4}))", "fixed", "digit", ""),
+                          (r"(?P<q>(?P<month>\d{1,2})[\s+/](?P<year>\d{2}))", "fixed", "digit", ""),
+                          (fr"(?P<year>{years})", "year", "digit", "")]
+        return tuple(family_builder)
@@ -1,7 +1,8 @@
+import dataclasses
 import datetime
-import re
 
-from text_mining_package import NicDate, DateCaptureRegex
+from text_mining_package import NicDate, DateMatcher
+from text_mining_package.text_normalizer import normalize_text, normalize_text_with_offsets, original_span
 
 
 class DateFinderx:
@@ -30,40 +31,39 @@ class DateFinderx:
         result_dict = self.apply_regexes(search_text=cleaned_text)
         self.pydate = self.create_pydate(result_dict=result_dict)
 
-    def clean_text(self, raw_text: str = None) -> str:
+    @staticmethod
+    def clean_text(raw_text: str = None) -> str:
         """
         The purpose of this function is to aid regex effectiveness by cleaning out character (period, comma, colon,
-        semicolon) from the test string. Double spaces are also eliminated.
+        semicolon) and the ordinal suffixes of days next to a month name (Mar 21st) from the test string.
+        Whitespace runs become single spaces.
+        See text_normalizer.normalize_text, which does it in one translate and one regex pass.
 
         :param raw_text: A string which will be used for date analysis.
         """
-        clean_text = re.sub(pattern=r"[.,;:]", string=raw_text, repl='')
-        cleaner_text = re.sub(pattern=r"\s{2,}", string=clean_text, repl=' ')
-        return cleaner_text
+        return normalize_text(raw_text=raw_text)
+
+    @staticmethod
+    def find_candidates(raw_text: str = '') -> list:
+        """
+        All candidates mode: every date in the text from one scan, with its span in the raw text, the pattern family
+        which matched it and its validity score. The date DateFinderx would pick is flagged as best.
+        :param raw_text: Raw text from which dates are to be extracted.
+        :return: list of DateCandidate in text order.
+        """
+        cleaned_text, offsets = normalize_text_with_offsets(raw_text=raw_text)
+        candidates = DateMatcher.default_matcher().find_candidates(search_text=cleaned_text)
+        return [dataclasses.replace(candidate, **dict(zip(('start', 'end'), original_span(
+            offsets=offsets, start=candidate.start, end=candidate.end)))) for candidate in candidates]
 
     def apply_regexes(self, search_text: str = str()):
         """
-        This function applies the regex patterns to the string, iterating until a match is found.
+        This function applies the date patterns to the string in a single pass, returning the match of the highest
+        priority pattern. When that pattern matches more than once, the most valid date is kept.
         :param search_text: String to search for a date with regexes It outputs a group dictionary
         :return: dictionary of month, day and year
         """
-        date_capture_regex = DateCaptureRegex.create_date_regex()
-
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # Iterate through the regexes. Have three cases, first, no match, just continue iterating
-        # second case, one result, grab the group dictionary of the first.
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        for dcr in date_capture_regex:
-            results = tuple(re.finditer(pattern=dcr, string=search_text))
-            if len(results) == 0:
-                continue
-            if len(results) == 1:
-                return results[0].groupdict()
-            if len(results) > 1:
-                validity_results = [(result, NicDate().valid_date(in_match_result=result)) for result in results]
-                validity_results = sorted(validity_results, key=lambda x: x[1], reverse=True)
-                best_result = validity_results[0][0].groupdict()
-                return best_result
+        return DateMatcher.default_matcher().search(search_text=search_text)
 
     def create_pydate(self, result_dict: dict = None):
         """
@@ -74,35 +74,15 @@ class DateFinderx:
         """
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # In the first section here, we get the year result. The year can be wither two or four digits.
-        # We extract the year as an integer. Two digit will yield a result less than 100. In which case
-        # (According to the requirements of the project we assume all years are 19XX) we just add 1900.
-        # Otherwise, we pass along the year as an integer.
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        year_seed = int(result_dict.get('year'))
-        if year_seed < 100:
-            year_seed = year_seed + 1900
-        self.year = year_seed
-
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # Now we extract the month. According to the specs, if the month is not present (None in Regex)
-        # Then we assume it's the first month of the year. Month can come in as a name "June" or a number
-        # in string format form the regex.  If it's a name, we use the month conversion dictionary
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        month_seed = result_dict.get('month', '1').lower()
-        if month_seed.isalpha():
-            month_num = int(NicDate.month_conversion_dict().get(month_seed, None))
-        else:
-            month_num = int(month_seed)
-            if not NicDate().is_valid_month(month=month_num):
-                month_num = 1
-
-        self.month = month_num
-
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        #  Extract the day. Day should always come in as numeric; so no high processing needed.
+        # Year, month and day come from NicDate.date_parts, which holds the rules of the project (two digit years
+        # are 19XX, a missing month or day is 1, a bad numeric month is 1). No match raises AttributeError, and a
+        # month word which is not a month name raises TypeError, as they always have here.
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        self.day = int(result_dict.get('day', 1))
+        if result_dict is None:
+            raise AttributeError("no date found")
+        self.year, self.month, self.day = NicDate.date_parts(result_dict=result_dict)
+        if self.month == 0:
+            raise TypeError(f"{result_dict['month']} is not a month name")
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         #  create a datetime.date object with the info.
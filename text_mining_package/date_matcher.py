@@ -0,0 +1,358 @@
+import itertools
+import re
+import time
+import typing
+from dataclasses import dataclass
+from functools import lru_cache
+
+from text_mining_package import DateCaptureRegex, NicDate
+
+
+@dataclass(frozen=True, slots=True)
+class DateCandidate:
+    """
+    One date found in a string by DateMatcher.find_candidates.
+    start and end are the span of the match, pattern is the index of its pattern family, score is the NicDate.valid_date
+    score (0-8), month, day and year are the captured strings (None when absent, bytes for a bytes matcher), and best
+    flags the first-match-wins date of the string.
+    """
+    start: int
+    end: int
+    pattern: int
+    score: int
+    month: str
+    day: str
+    year: str
+    best: bool
+
+
+class DateMatcher:
+    """
+    The purpose of this class is to find the first-match-wins date in a string while only scanning the string once.
+    All pattern families are combined into a single scanner made of lookaheads, so every start position in the text
+    reports the highest priority family that matches there. The winning family is then resolved with the same rules as
+    the sequential scan over DateCaptureRegex.create_date_regex().
+    In front of the scanner sits a prefilter: one cheap look at the line tells whether it has digits, month names,
+    slashes and dashes, and only the families which could match such a line are scanned for.
+    Per family counters are switched on with enable_stats.
+    A matcher built with text_type=bytes compiles the same patterns as bytes patterns, and searches ASCII bytes with
+    the same results (spans, families and captured parts as bytes) as the str matcher on the decoded text.
+    :param families: tuple of (regex string, ranking rule, lead, required character) as produced by
+        DateCaptureRegex.create_date_regex_families()
+    :param text_type: str or bytes, the type of the text searched.
+    """
+
+    def __init__(self, families: tuple = None, text_type: type = str):
+        if families is None:
+            families = DateCaptureRegex.create_date_regex_families()
+
+        self.families = tuple(families)
+        self.text_type = text_type
+        self.family_patterns = tuple(self.compile_pattern(pattern=family) for family, _, _, _ in families)
+        self.family_rankings = tuple(ranking for _, ranking, _, _ in families)
+        self.month_ranks = {}
+        for rank, month in enumerate(itertools.chain(NicDate.month_names_short(), NicDate.month_names_long())):
+            self.month_ranks.setdefault(self.as_text(text=month.lower()), rank)
+
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # Prefilter. Every family needs a digit, month families need a month name (every long name contains its
+        # short name, and names may sit inside longer words, so a substring test is the exact one), and some need
+        # a literal character. Scanners are built per combination of features the first time one is seen.
+        # The substring test is one regex search over the lower cased line, which is quicker than twelve in tests.
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        short_months = "|".join(month.lower() for month in NicDate.month_names_short())
+        self.short_month = re.compile(self.as_text(text=short_months))
+        self.required_characters = tuple(self.as_text(text=required)
+                                         for required in sorted(set(required for _, _, _, required in families
+                                                                    if required)))
+        self.digit = self.compile_pattern(pattern=r"[0-9]")
+        self.scanners = {}
+
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # Instrumentation, off until enable_stats is called. Family names are the first named group of each family.
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        self.family_names = tuple(re.search(r"\(\?P<(\w+)>", family).group(1) for family, _, _, _ in families)
+        self.stats = None
+        self.table = None
+
+    def validity_table(self):
+        """
+        The validity table, kept on the matcher after the first ambiguous line. Imported here so NumPy is only loaded
+        (to build the table) once an ambiguous line is seen.
+        :return: DateValidityTable
+        """
+        if self.table is None:
+            from text_mining_package.date_validity_table import DateValidityTable
+            self.table = DateValidityTable.default_table()
+        return self.table
+
+    def as_text(self, text: str = str()) -> typing.Union[str, bytes]:
+        """
+        Turns a pattern or name into the text type of the matcher.
+        :param text: ASCII string
+        :return: text as str or bytes
+        """
+        return text.encode("ascii") if self.text_type is bytes else text
+
+    def compile_pattern(self, pattern: str = str()) -> re.Pattern:
+        """
+        Compiles a pattern, case insensitive, for the text type of the matcher.
+        :param pattern: regex string
+        :return: compiled pattern
+        """
+        return re.compile(pattern=self.as_text(text=pattern), flags=re.IGNORECASE)
+
+    def build_scanner(self, family_indexes: typing.Iterable[int] = ()) -> tuple:
+        """
+        This function combines the given families into one scanner made of lookaheads.
+        Named groups can not repeat inside one pattern, so they are turned into non capturing groups. Each family
+        is wrapped in one numbered group, so match.lastindex tells which family matched.
+        Families are gated by what they start with: a digit, or one of the short month names (every long name
+        starts with its short name). Most positions in a note fail the cheap gate and never try a family.
+        A digit and a month name can't start at the same position, so priority order only matters inside a gate.
+        :param family_indexes: indexes of the families to scan for
+        :return: (compiled scanner, tuple mapping scanner group number - 1 to family index)
+        """
+        named_group = re.compile(r"\(\?P<\w+>")
+        short_months = tuple(month.lower() for month in NicDate.month_names_short())
+        first_letters = "".join(sorted(set(month[0] for month in short_months)))
+        gates = {"digit": "(?=[0-9])", "month": f"(?=[{first_letters}])(?={'|'.join(short_months)})"}
+
+        scanner_families = []
+        gated_branches = []
+        for lead, gate in gates.items():
+            lead_families = [index for index in family_indexes if self.families[index][2] == lead]
+            if not lead_families:
+                continue
+            scanner_families.extend(lead_families)
+            branches = "|".join(f"({named_group.sub('(?:', self.families[index][0])})" for index in lead_families)
+            gated_branches.append(f"{gate}(?:{branches})")
+        if not gated_branches:
+            return None, ()
+        scanner = self.compile_pattern(pattern=f"(?=(?:{'|'.join(gated_branches)}))")
+        return scanner, tuple(scanner_families)
+
+    def prefilter(self, search_text: str = str()) -> tuple:
+        """
+        The purpose of this function is to pick the scanner for a line from what the line contains.
+        :param search_text: String to search for dates.
+        :return: (compiled scanner, family mapping) as returned by build_scanner; the scanner is None when no family
+            can match the line.
+        """
+        if self.digit.search(search_text) is None:
+            return None, ()
+        has_month = self.short_month.search(search_text.lower()) is not None
+        present = tuple(character for character in self.required_characters if character in search_text)
+        features = (has_month, present)
+        if features not in self.scanners:
+            family_indexes = [index for index, (_, ranking, lead, required) in enumerate(self.families)
+                              if (has_month or "month" not in (ranking, lead))
+                              and (not required or self.as_text(text=required) in present)]
+            self.scanners[features] = self.build_scanner(family_indexes=family_indexes)
+        return self.scanners[features]
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def default_matcher():
+        """
+        Builds the matcher for the standard date families once, and hands back the same instance afterwards.
+        :return: DateMatcher
+        """
+        return DateMatcher()
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def default_bytes_matcher():
+        """
+        Builds the bytes matcher for the standard date families once, and hands back the same instance afterwards.
+        :return: DateMatcher
+        """
+        return DateMatcher(text_type=bytes)
+
+    def rank_match(self, family_index: int = 0, match: re.Match = None) -> int:
+        """
+        The purpose of this function is to order matches inside one family the same way the per value patterns were
+        ordered: month families by position in the month name list, the year family by ascending year.
+        :param family_index: index of the family which produced the match
+        :param match: match object of the family pattern
+        :return: integer, lower ranks win.
+        """
+        ranking = self.family_rankings[family_index]
+        if ranking == "month":
+            return self.month_ranks[match.group('month').lower()]
+        if ranking == "year":
+            return int(match.group('year'))
+        return 0
+
+    def scan(self, search_text: str = str()) -> list:
+        """
+        One pass over the text, collecting the start positions of the best family found at each position.
+        Only the families the prefilter lets through are scanned for; lines no family can match are not scanned.
+        :param search_text: String to search for dates.
+        :return: list of (family index, start position) in text order.
+        """
+        scanner, scanner_families = self.prefilter(search_text=search_text)
+        if scanner is None:
+            return []
+        return [(scanner_families[hit.lastindex - 1], hit.start()) for hit in scanner.finditer(search_text)]
+
+    def pick_best(self, search_text: str = str(), hits: list = None) -> tuple:
+        """
+        This function applies the first-match-wins rules of the sequential scan to the hits of one scan.
+        :param search_text: String the hits were found in.
+        :param hits: list of (family index, start position) as returned by scan.
+        :return: (family index, re.Match), or (-1, None) if there are no hits.
+        """
+        if not hits:
+            return -1, None
+        family_index = min(hits)[0]
+        family_pattern = self.family_patterns[family_index]
+        matches = [family_pattern.match(search_text, position) for index, position in hits if index == family_index]
+
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # Keep the best ranked value of the family, then drop overlapping matches the way re.finditer would.
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        ranks = [self.rank_match(family_index=family_index, match=match) for match in matches]
+        best_rank = min(ranks)
+        results = []
+        last_end = 0
+        for match, rank in zip(matches, ranks):
+            if rank == best_rank and match.start() >= last_end:
+                results.append(match)
+                last_end = match.end()
+
+        if len(results) == 1:
+            return family_index, results[0]
+
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # Several candidates: score each with one lookup in the flat validity table, the first of the best scores
+        # wins.
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        table = self.validity_table()
+        scores = [table.score_group_dict(group_dict=result.groupdict()) for result in results]
+        return family_index, results[scores.index(max(scores))]
+
+    def search_match(self, search_text: str = str()) -> tuple:
+        """
+        This function finds the date in the string, returning the winning match and the index of its family.
+        :param search_text: String to search for a date.
+        :return: (family index, re.Match), or (-1, None) if no date was found.
+        """
+        if self.stats is not None:
+            return self.observed_search_match(search_text=search_text)
+        return self.pick_best(search_text=search_text, hits=self.scan(search_text=search_text))
+
+    def enable_stats(self):
+        """
+        The purpose of this function is to switch on per family counters for search_match, starting from zero.
+        Families are not reordered by what they win: the single scanner already tries every family the prefilter lets
+        through in one pass, and trying a frequent winner first costs an extra search per line.
+        """
+        family_count = len(self.families)
+        self.stats = {'lines': 0, 'skipped': 0, 'scan_time_ns': 0, 'total_time_ns': 0, 'attempts': [0] * family_count,
+                      'hits': [0] * family_count, 'wins': [0] * family_count, 'match_time_ns': [0] * family_count}
+
+    def disable_stats(self):
+        """
+        Switches the counters off, search_match goes back to the plain scan.
+        """
+        self.stats = None
+
+    def stats_snapshot(self) -> dict:
+        """
+        The purpose of this function is to export the counters as plain data, ready for json.dumps.
+        Per family: attempts counts the lines the family was scanned for, hits the lines where the scanner reported
+        it at some position, wins the lines it produced the date of, and match_time_ns the time spent matching and
+        ranking its candidates. The single scanner tries all families at once, so its time is reported as a whole in
+        scan_time_ns. Counters are per process: worker processes keep their own.
+        :return: dictionary of totals and a list of per family dictionaries in priority order, or None when the
+            counters are off.
+        """
+        if self.stats is None:
+            return None
+        stats = self.stats
+        families = [{'family': index, 'name': self.family_names[index], 'pattern': self.families[index][0],
+                     'attempts': stats['attempts'][index], 'hits': stats['hits'][index], 'wins': stats['wins'][index],
+                     'match_time_ns': stats['match_time_ns'][index]} for index in range(len(self.families))]
+        totals = {key: value for key, value in stats.items() if not isinstance(value, list)}
+        return {**totals, 'families': families}
+
+    def observed_search_match(self, search_text: str = str()) -> tuple:
+        """
+        search_match with the counters of enable_stats.
+        :param search_text: String to search for a date.
+        :return: (family index, re.Match), or (-1, None) if no date was found.
+        """
+        stats = self.stats
+        start = time.perf_counter_ns()
+        stats['lines'] += 1
+
+        scanner, scanner_families = self.prefilter(search_text=search_text)
+        if scanner is None:
+            stats['skipped'] += 1
+            stats['total_time_ns'] += time.perf_counter_ns() - start
+            return -1, None
+        for family_index in scanner_families:
+            stats['attempts'][family_index] += 1
+
+        scan_start = time.perf_counter_ns()
+        hits = [(scanner_families[hit.lastindex - 1], hit.start()) for hit in scanner.finditer(search_text)]
+        match_start = time.perf_counter_ns()
+        stats['scan_time_ns'] += match_start - scan_start
+        for family_index in set(index for index, _ in hits):
+            stats['hits'][family_index] += 1
+        result = self.pick_best(search_text=search_text, hits=hits)
+        if result[1] is not None:
+            stats['match_time_ns'][result[0]] += time.perf_counter_ns() - match_start
+
+        if result[1] is not None:
+            stats['wins'][result[0]] += 1
+        stats['total_time_ns'] += time.perf_counter_ns() - start
+        return result
+
+    def find_candidates(self, search_text: str = str()) -> list:
+        """
+        The purpose of this function is to return every date in the string from the same single scan.
+        Matches are accepted from the most likely down (validity score, then family priority, rank and position),
+        skipping any that overlap an accepted one, so fragments such as the year inside 12/25/1990 are not reported on
+        their own. The first-match-wins date is always accepted first and flagged as best.
+        :param search_text: String to search for dates.
+        :return: list of DateCandidate in text order.
+        """
+        hits = self.scan(search_text=search_text)
+        best_family, best_match = self.pick_best(search_text=search_text, hits=hits)
+        if best_match is None:
+            return []
+
+        matches = [(index, self.family_patterns[index].match(search_text, position)) for index, position in hits]
+        group_dicts = [match.groupdict() for _, match in matches]
+        table = self.validity_table()
+        scores = [table.score_group_dict(group_dict=group_dict) for group_dict in group_dicts]
+        order = sorted(range(len(matches)), key=lambda item: (-scores[item], matches[item][0],
+                                                              self.rank_match(*matches[item]),
+                                                              matches[item][1].start()))
+        best_item = hits.index((best_family, best_match.start()))
+
+        accepted = []
+        for item in [best_item] + order:
+            match = matches[item][1]
+            if all(match.end() <= matches[kept][1].start() or match.start() >= matches[kept][1].end()
+                   for kept in accepted):
+                accepted.append(item)
+        accepted.sort(key=lambda item: matches[item][1].start())
+
+        return [DateCandidate(start=matches[item][1].start(), end=matches[item][1].end(), pattern=matches[item][0],
+                              score=scores[item], month=group_dicts[item].get('month'),
+                              day=group_dicts[item].get('day'), year=group_dicts[item]['year'], best=item == best_item)
+                for item in accepted]
+
+    def search(self, search_text: str = str()):
+        """
+        This function finds the date in the string, returning the same group dictionary the sequential scan would.
+        :param search_text: String to search for a date.
+        :return: dictionary of month, day and year, or None if no date was found.
+        """
+        _, match = self.search_match(search_text=search_text)
+        if match is None:
+            return None
+        return match.groupdict()
@@ -0,0 +1,148 @@
+import functools
+import hashlib
+import json
+import mmap
+import os
+import typing
+
+import numpy as np
+
+from text_mining_package.batch_date_finder import map_in_order
+from text_mining_package.date_records import DATE_RECORD_DTYPE, date_records_from_file_chunk
+from text_mining_package.file_date_finder import split_file
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# A date record store is a file of packed DATE_RECORD_DTYPE records, one per line of a note file, next to a JSON
+# manifest naming how far the note file was processed. The store is only appended to, and the manifest is replaced
+# after every chunk, so an interrupted run loses at most the chunk in progress.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+MANIFEST_VERSION = 1
+FINGERPRINT_BYTES = 1 << 16
+
+
+def manifest_path(store_path: typing.Union[str, os.PathLike]) -> str:
+    """
+    :param store_path: path of the record store
+    :return: path of its manifest
+    """
+    return f"{os.fspath(store_path)}.manifest.json"
+
+
+def file_fingerprint(path: typing.Union[str, os.PathLike], offset: int = 0) -> str:
+    """
+    The purpose of this function is to recognise the processed part of a note file without reading all of it.
+    The first and the last FINGERPRINT_BYTES bytes before offset are hashed, so a replaced, rotated or rewritten file
+    is told apart from one that was only appended to.
+    :param path: path of the note file
+    :param offset: number of processed bytes
+    :return: hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(offset).encode("ascii"))
+    if offset == 0:
+        return digest.hexdigest()
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        digest.update(mapped[:min(offset, FINGERPRINT_BYTES)])
+        digest.update(mapped[max(0, offset - FINGERPRINT_BYTES):offset])
+    return digest.hexdigest()
+
+
+def read_manifest(store_path: typing.Union[str, os.PathLike]) -> dict:
+    """
+    :param store_path: path of the record store
+    :return: manifest dictionary, or None when there is none or it can't be read.
+    """
+    try:
+        with open(manifest_path(store_path=store_path), encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(store_path: typing.Union[str, os.PathLike], manifest: dict):
+    """
+    Replaces the manifest in one step, a crash leaves either the old or the new one.
+    """
+    temporary_path = manifest_path(store_path=store_path) + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, manifest_path(store_path=store_path))
+
+
+def update_date_store(path: typing.Union[str, os.PathLike], store_path: typing.Union[str, os.PathLike],
+                      workers: int = 1, chunk_bytes: int = 1 << 24, encoding: str = "utf-8",
+                      complete_lines_only: bool = True) -> dict:
+    """
+    The purpose of this function is to bring the record store of an append only note file up to date, extracting only
+    the lines added since the last run. When the manifest is missing, does not match the note file (different
+    fingerprint, file shorter than the processed offset), was made with another encoding or counts more records than
+    the store holds (store deleted or cut short), the store is rebuilt from the start. Records written after the last
+    manifest, by an interrupted run, are dropped and redone. The store ends up with the same bytes
+    as a single run over the whole file would write.
+    :param path: path of the note file, one note per line.
+    :param store_path: path of the record store, the manifest is kept next to it.
+    :param workers: number of worker processes. 1 runs in the calling process.
+    :param chunk_bytes: target size of a chunk in bytes, the manifest is updated after each chunk.
+    :param encoding: text encoding of the note file.
+    :param complete_lines_only: leave a last line without a line ending for the next run, as it may still be
+        written to.
+    :return: the final manifest
+    """
+    if chunk_bytes < 1:
+        raise ValueError("chunk_bytes must be at least 1")
+
+    path = os.fspath(path)
+    store_path = os.fspath(store_path)
+    size = os.path.getsize(path)
+    fresh_manifest = {'version': MANIFEST_VERSION, 'source': os.path.abspath(path), 'encoding': encoding,
+                      'dtype': str(DATE_RECORD_DTYPE.descr), 'offset': 0, 'lines': 0,
+                      'fingerprint': file_fingerprint(path=path, offset=0)}
+    manifest = read_manifest(store_path=store_path)
+    store_size = os.path.getsize(store_path) if os.path.exists(store_path) else 0
+    if (manifest is None or any(manifest.get(key) != fresh_manifest[key] for key in ('version', 'encoding', 'dtype'))
+            or manifest['offset'] > size or store_size < manifest['lines'] * DATE_RECORD_DTYPE.itemsize
+            or manifest['fingerprint'] != file_fingerprint(path=path, offset=manifest['offset'])):
+        manifest = fresh_manifest
+        # The new manifest goes first, so a rebuild interrupted before its first chunk leaves an empty store which the
+        # manifest agrees with, instead of an emptied store under the old manifest.
+        write_manifest(store_path=store_path, manifest=manifest)
+
+    # Anything past the records the manifest knows about comes from an interrupted run.
+    with open(store_path, "ab") as store:
+        store.truncate(manifest['lines'] * DATE_RECORD_DTYPE.itemsize)
+
+    stop = size
+    if complete_lines_only and size > manifest['offset']:
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            stop = mapped.rfind(b"\n", manifest['offset'], size) + 1 or manifest['offset']
+
+    byte_ranges = list(split_file(path=path, chunk_bytes=chunk_bytes, start=manifest['offset'], stop=stop))
+    chunk_function = functools.partial(date_records_from_file_chunk, path=path, encoding=encoding)
+    with open(store_path, "ab") as store:
+        for (_, end), records in zip(byte_ranges, map_in_order(function=chunk_function, tasks=byte_ranges,
+                                                               workers=workers)):
+            records['line'] += manifest['lines']
+            store.write(records.tobytes())
+            store.flush()
+            os.fsync(store.fileno())
+            manifest = {**manifest, 'offset': end, 'lines': manifest['lines'] + len(records),
+                        'fingerprint': file_fingerprint(path=path, offset=end)}
+            write_manifest(store_path=store_path, manifest=manifest)
+    return manifest
+
+
+def load_date_store(store_path: typing.Union[str, os.PathLike]) -> np.ndarray:
+    """
+    The purpose of this function is to open the records of a store, memory mapped, up to the last manifest.
+    :param store_path: path of the record store
+    :return: numpy array of DATE_RECORD_DTYPE, one record per processed line.
+    :raises ValueError: if the store is shorter than the records of the manifest.
+    """
+    manifest = read_manifest(store_path=store_path)
+    if manifest is None or manifest['lines'] == 0:
+        return np.zeros(0, dtype=DATE_RECORD_DTYPE)
+    if os.path.getsize(store_path) < manifest['lines'] * DATE_RECORD_DTYPE.itemsize:
+        raise ValueError(f"{os.fspath(store_path)} is shorter than the {manifest['lines']} records of its manifest")
+    return np.memmap(store_path, dtype=DATE_RECORD_DTYPE, mode='r', shape=(manifest['lines'],))
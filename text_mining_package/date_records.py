@@ -0,0 +1,178 @@
+import array
+import functools
+import os
+import typing
+
+import numpy as np
+
+from text_mining_package import DateMatcher, NicDate
+from text_mining_package.batch_date_finder import chunk_notes, map_cached, map_in_order
+from text_mining_package.date_finder import DateFinderx
+from text_mining_package.date_validity_table import DateValidityTable
+from text_mining_package.file_date_finder import ascii_compatible, read_chunk_lines, split_file
+from text_mining_package.result_cache import ResultCache
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# One packed 22 byte record per note. pattern is the index of the winning pattern family (-1 when no date was found),
+# start and end are the span of the match in the cleaned text. valid is False when the parts are not a real date.
+# Notes may be str or bytes. ASCII bytes are cleaned and matched as bytes, with the bytes matcher, and their captured
+# digits go straight to int, so no str is made for them. Other bytes are decoded and take the str path. Both paths
+# give the same records.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+DATE_RECORD_DTYPE = np.dtype([('line', np.int64), ('year', np.int16), ('month', np.int8), ('day', np.int8),
+                              ('valid', np.bool_), ('pattern', np.int8), ('start', np.int32), ('end', np.int32)])
+
+
+def date_records_from_notes(notes: typing.Iterable[typing.Union[str, bytes]], first_line: int = 0,
+                            encoding: str = "utf-8") -> np.ndarray:
+    """
+    The purpose of this function is to extract the dates of a batch of notes straight into a structured array.
+    Parts are gathered in typed columns while matching, and validated in one vectorized call at the end, so no
+    DateFinderx or datetime.date is created. Year, month and day follow the rules of NicDate.date_parts.
+    :param notes: iterable of note strings, or of note bytes
+    :param first_line: line number of the first note
+    :param encoding: text encoding of non ASCII note bytes, undecodable bytes are replaced.
+    :return: numpy array of DATE_RECORD_DTYPE, one record per note.
+    """
+    str_matcher = DateMatcher.default_matcher()
+    bytes_matcher = DateMatcher.default_bytes_matcher()
+    years, months, days, patterns = array.array('h'), array.array('b'), array.array('b'), array.array('b')
+    starts, ends = array.array('i'), array.array('i')
+
+    for raw_text in notes:
+        matcher = str_matcher
+        if isinstance(raw_text, bytes):
+            if raw_text.isascii():
+                matcher = bytes_matcher
+            else:
+                raw_text = raw_text.decode(encoding, errors="replace")
+        family_index, match = matcher.search_match(search_text=DateFinderx.clean_text(raw_text=raw_text))
+        if match is None:
+            years.append(0)
+            months.append(0)
+            days.append(0)
+            patterns.append(-1)
+            starts.append(-1)
+            ends.append(-1)
+            continue
+
+        year, month, day = NicDate.date_parts(result_dict=match.groupdict())
+        years.append(year)
+        months.append(month)
+        days.append(day)
+        patterns.append(family_index)
+        starts.append(match.start())
+        ends.append(match.end())
+
+    records = np.zeros(len(years), dtype=DATE_RECORD_DTYPE)
+    records['line'] = np.arange(first_line, first_line + len(records))
+    records['year'] = np.frombuffer(years, dtype=np.int16)
+    records['month'] = np.frombuffer(months, dtype=np.int8)
+    records['day'] = np.frombuffer(days, dtype=np.int8)
+    records['pattern'] = np.frombuffer(patterns, dtype=np.int8)
+    records['start'] = np.frombuffer(starts, dtype=np.int32)
+    records['end'] = np.frombuffer(ends, dtype=np.int32)
+    found = records['pattern'] >= 0
+    records['valid'] = found & ~np.isnat(DateValidityTable.calendar_dates(years=records['year'],
+                                                                          months=records['month'], days=records['day']))
+    return records
+
+
+def date_records_from_chunk(chunk: tuple = ()) -> np.ndarray:
+    """
+    Worker side of iter_date_records.
+    :param chunk: tuple of note strings
+    :return: numpy array of DATE_RECORD_DTYPE, line numbers relative to the chunk.
+    """
+    return date_records_from_notes(notes=chunk)
+
+
+def date_record_rows_from_chunk(chunk: tuple = ()) -> list:
+    """
+    Worker side of iter_date_records with a cache: one record tuple per note, to be stored in the cache.
+    :param chunk: tuple of note strings
+    :return: list of record tuples
+    """
+    return date_records_from_notes(notes=chunk).tolist()
+
+
+def iter_date_records(notes: typing.Iterable[str], workers: int = 1, chunksize: int = 65536,
+                      cache: ResultCache = None) -> typing.Iterator:
+    """
+    The purpose of this function is to stream compact date records for many notes, one structured array per chunk.
+    :param notes: iterable of note strings, it is consumed lazily.
+    :param workers: number of worker processes. 1 runs in the calling process.
+    :param chunksize: number of notes per chunk.
+    :param cache: optional ResultCache of record tuples by cleaned line, repeated lines are only matched once.
+    :return: iterator of numpy arrays of DATE_RECORD_DTYPE, in input order, with global line numbers.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    if cache is None:
+        chunk_records = map_in_order(function=date_records_from_chunk,
+                                     tasks=chunk_notes(notes=notes, chunksize=chunksize), workers=workers)
+    else:
+        chunk_records = (np.array(rows, dtype=DATE_RECORD_DTYPE)
+                         for rows in map_cached(function=date_record_rows_from_chunk, notes=notes, cache=cache,
+                                                workers=workers, chunksize=chunksize))
+    first_line = 0
+    for records in chunk_records:
+        records['line'] = np.arange(first_line, first_line + len(records))
+        first_line += len(records)
+        yield records
+
+
+def find_date_records(notes: typing.Iterable[str], workers: int = 1, chunksize: int = 65536,
+                      cache: ResultCache = None) -> np.ndarray:
+    """
+    The purpose of this function is to extract the dates of many notes into a single structured array.
+    :param notes: iterable of note strings
+    :param workers: number of worker processes. 1 runs in the calling process.
+    :param chunksize: number of notes per chunk.
+    :param cache: optional ResultCache of record tuples by cleaned line.
+    :return: numpy array of DATE_RECORD_DTYPE, one record per note.
+    """
+    chunks = list(iter_date_records(notes=notes, workers=workers, chunksize=chunksize, cache=cache))
+    if not chunks:
+        return np.zeros(0, dtype=DATE_RECORD_DTYPE)
+    return np.concatenate(chunks)
+
+
+def date_records_from_file_chunk(byte_range: tuple = (), path: str = str(), encoding: str = "utf-8") -> np.ndarray:
+    """
+    Worker side of iter_date_records_in_file.
+    :param byte_range: (start, end) byte offsets of the chunk
+    :param path: path of the note file
+    :param encoding: text encoding of the file
+    :return: numpy array of DATE_RECORD_DTYPE, line numbers relative to the chunk.
+    """
+    decode = not ascii_compatible(encoding=encoding)
+    return date_records_from_notes(notes=(raw_text for _, raw_text in read_chunk_lines(byte_range=byte_range, path=path,
+                                                                                        encoding=encoding,
+                                                                                        decode=decode)),
+                                   encoding=encoding)
+
+
+def iter_date_records_in_file(path: typing.Union[str, os.PathLike], workers: int = 1, chunk_bytes: int = 1 << 24,
+                              encoding: str = "utf-8") -> typing.Iterator:
+    """
+    The purpose of this function is to stream compact date records for every line of a note file, one structured
+    array per newline aligned chunk of the memory mapped file.
+    :param path: path of the note file, one note per line.
+    :param workers: number of worker processes. 1 runs in the calling process.
+    :param chunk_bytes: target size of a chunk in bytes.
+    :param encoding: text encoding of the file.
+    :return: iterator of numpy arrays of DATE_RECORD_DTYPE, in file order, line numbers start at 0.
+    """
+    if chunk_bytes < 1:
+        raise ValueError("chunk_bytes must be at least 1")
+
+    path = os.fspath(path)
+    chunk_function = functools.partial(date_records_from_file_chunk, path=path, encoding=encoding)
+    first_line = 0
+    for records in map_in_order(function=chunk_function, tasks=split_file(path=path, chunk_bytes=chunk_bytes),
+                                workers=workers):
+        records['line'] += first_line
+        first_line += len(records)
+        yield records
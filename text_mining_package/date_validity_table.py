@@ -0,0 +1,97 @@
+import calendar
+import typing
+from functools import lru_cache
+
+import numpy as np
+
+from text_mining_package.nic_date_date_class import NicDate
+
+
+class DateValidityTable:
+    """
+    The DateValidityTable class scores date candidates with precomputed lookup tables instead of per candidate checks.
+    Scores follow NicDate.valid_date: 0 for an invalid year, 1 when the year is valid but the month is not, 4 when the
+    month is valid or missing but the day is not, and 8 for a fully valid date. A missing month or day counts as valid.
+    The day check uses the real length of the month, leap years included.
+    """
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # Table axes. Year slot 0 holds every invalid year, slots 1-129 are 1901-2029 (two digit years map onto 19XX).
+    # Month slot 0 and day slot 0 hold invalid values, the last slot of each axis holds a missing value.
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    first_year = 1900
+    last_year = 2030
+    missing_month = 13
+    missing_day = 32
+
+    def __init__(self):
+        year_count = self.last_year - self.first_year
+        self.scores = np.zeros((year_count, self.missing_month + 1, self.missing_day + 1), dtype=np.uint8)
+        for year_slot in range(1, year_count):
+            year = self.first_year + year_slot
+            self.scores[year_slot, 0, :] = 1
+            self.scores[year_slot, 1:, :] = 4
+            self.scores[year_slot, 1:, self.missing_day] = 8
+            self.scores[year_slot, self.missing_month, :] = 8
+            for month in range(1, 13):
+                self.scores[year_slot, month, 1:calendar.monthrange(year, month)[1] + 1] = 8
+
+        # Keyed by str and by ASCII bytes, for the captures of both kinds of DateMatcher.
+        self.month_numbers = NicDate.month_numbers()
+
+        # The same table as flat bytes, indexed by score_group_dict.
+        self.flat_scores = self.scores.tobytes()
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def default_table():
+        """
+        Builds the tables once, and hands back the same instance afterwards.
+        :return: DateValidityTable
+        """
+        return DateValidityTable()
+
+    def score_group_dict(self, group_dict: dict) -> int:
+        """
+        The purpose of this function is to score a candidate with one index into the flat table, without NumPy: the
+        candidates of a line are few, and building arrays for them costs more than the lookups.
+        Two digit years are 19XX, out of range parts and month words which are not month names land in slot 0.
+        :param group_dict: group dictionary with year, and optionally month and day.
+        :return: score (0, 1, 4 or 8)
+        """
+        year, month, day = group_dict.get('year'), group_dict.get('month'), group_dict.get('day')
+        year = int(year) if year else 0
+        if 0 < year < 100:
+            year += self.first_year
+        year_slot = year - self.first_year if self.first_year < year < self.last_year else 0
+        if month is None:
+            month_slot = self.missing_month
+        elif month.isdigit():
+            month_slot = int(month) if 0 < int(month) < 13 else 0
+        else:
+            month_slot = self.month_numbers.get(month.lower(), 0)
+        day = int(day) if day else -1
+        day_slot = self.missing_day if day == -1 else (day if 0 < day < 32 else 0)
+        return self.flat_scores[(year_slot * (self.missing_month + 1) + month_slot) * (self.missing_day + 1) + day_slot]
+
+    @staticmethod
+    def calendar_dates(years: typing.Sequence[int], months: typing.Sequence[int],
+                       days: typing.Sequence[int]) -> np.ndarray:
+        """
+        The purpose of this function is to turn batches of four digit years, months and days into dates, keeping only
+        the real calendar dates (the ones datetime.date would accept).
+        :param years: four digit years
+        :param months: month numbers
+        :param days: days
+        :return: numpy datetime64[D] array, NaT where the parts are not a real date.
+        """
+        years = np.asarray(years, dtype=np.int64)
+        months = np.asarray(months, dtype=np.int64)
+        days = np.asarray(days, dtype=np.int64)
+
+        valid = (years >= 1) & (years <= 9999) & (months >= 1) & (months <= 12)
+        month_start = ((np.where(valid, years, 1970) - 1970) * 12 + np.where(valid, months, 1) - 1)
+        month_start = month_start.astype('datetime64[M]').astype('datetime64[D]')
+        days_in_month = (month_start.astype('datetime64[M]') + 1).astype('datetime64[D]') - month_start
+        valid &= (days >= 1) & (days <= days_in_month.astype(np.int64))
+        return np.where(valid, month_start + (days - 1), np.datetime64('NaT', 'D'))
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import typing
+import zipfile
+
+import numpy as np
+
+from text_mining_package.date_records import DATE_RECORD_DTYPE
+
+# Columns written for every note, in order. The full record (with match spans) is only kept by the npy format.
+OUTPUT_COLUMNS = ('line', 'year', 'month', 'day', 'pattern', 'valid')
+
+
+class NpyStreamWriter:
+    """
+    The purpose of this class is to write a .npy array whose length is only known at the end. Arrays are appended to
+    a buffered temporary file as raw bytes, and the header is written in front of them by close.
+    :param dtype: numpy dtype of the array
+    :param buffer_bytes: size of the write buffer
+    """
+
+    def __init__(self, dtype: np.dtype = np.int64, buffer_bytes: int = 1 << 20):
+        self.dtype = np.dtype(dtype)
+        self.buffer_bytes = buffer_bytes
+        self.raw = tempfile.TemporaryFile(buffering=buffer_bytes)
+        self.count = 0
+
+    def write(self, array: np.ndarray):
+        """
+        Appends the values of array.
+        """
+        self.raw.write(np.ascontiguousarray(array, dtype=self.dtype).tobytes())
+        self.count += len(array)
+
+    def close(self, file: typing.BinaryIO):
+        """
+        Writes the .npy header and the appended values into file, then drops the temporary file.
+        :param file: binary file object open for writing
+        """
+        header = {'descr': np.lib.format.dtype_to_descr(self.dtype), 'fortran_order': False, 'shape': (self.count,)}
+        np.lib.format.write_array_header_1_0(file, header)
+        self.raw.seek(0)
+        shutil.copyfileobj(self.raw, file, self.buffer_bytes)
+        self.raw.close()
+
+
+class DateRecordWriter:
+    """
+    The purpose of this class is to write date records (DATE_RECORD_DTYPE) to disk in bulk, one chunk at a time:
+    npy (the structured records), npz (one array per output column), csv (output columns, with a header row) or
+    parquet (output columns, needs pyarrow). Every write goes through a buffer of buffer_bytes.
+        with DateRecordWriter(path="dates.npz") as writer:
+            for records in iter_date_records_in_file(path="dates.txt"):
+                writer.write(records)
+    :param path: output path
+    :param output_format: one of formats, taken from the suffix of path when None.
+    :param buffer_bytes: size of the write buffers
+    """
+
+    formats = ('npy', 'npz', 'csv', 'parquet')
+
+    def __init__(self, path: typing.Union[str, os.PathLike], output_format: str = None, buffer_bytes: int = 1 << 20):
+        self.path = os.fspath(path)
+        self.output_format = output_format or os.path.splitext(self.path)[1].lstrip('.').lower()
+        if self.output_format not in self.formats:
+            raise ValueError(f"output format must be one of {', '.join(self.formats)}, not {self.output_format!r}")
+        self.buffer_bytes = buffer_bytes
+        self.rows = 0
+        self.record_writer = None
+        self.column_writers = {}
+        self.file = None
+        self.parquet_writer = None
+
+        if self.output_format == 'npy':
+            self.record_writer = NpyStreamWriter(dtype=DATE_RECORD_DTYPE, buffer_bytes=buffer_bytes)
+        elif self.output_format == 'npz':
+            self.column_writers = {column: NpyStreamWriter(dtype=DATE_RECORD_DTYPE[column], buffer_bytes=buffer_bytes)
+                                   for column in OUTPUT_COLUMNS}
+        elif self.output_format == 'csv':
+            self.file = open(self.path, "w", encoding="ascii", newline="", buffering=buffer_bytes)
+            self.file.write(",".join(OUTPUT_COLUMNS) + "\n")
+            self.csv_row = ",".join("%d" for _ in OUTPUT_COLUMNS) + "\n"
+        else:
+            # Imported here, pyarrow is only needed for parquet output.
+            import pyarrow
+            import pyarrow.parquet
+            self.pyarrow = pyarrow
+            self.parquet_writer = pyarrow.parquet.ParquetWriter(self.path, pyarrow.schema(
+                [(column, pyarrow.from_numpy_dtype(DATE_RECORD_DTYPE[column])) for column in OUTPUT_COLUMNS]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, records: np.ndarray):
+        """
+        Writes one chunk of records.
+        :param records: numpy array of DATE_RECORD_DTYPE
+        """
+        self.rows += len(records)
+        if self.output_format == 'npy':
+            self.record_writer.write(records)
+        elif self.output_format == 'npz':
+            for column, writer in self.column_writers.items():
+                writer.write(records[column])
+        elif self.output_format == 'csv':
+            # One % formatting call for the whole chunk, instead of one per row as np.savetxt does.
+            values = np.column_stack([records[column].astype(np.int64) for column in OUTPUT_COLUMNS]).ravel().tolist()
+            self.file.write(self.csv_row * len(records) % tuple(values))
+        else:
+            self.parquet_writer.write_table(self.pyarrow.table({column: records[column] for column in OUTPUT_COLUMNS},
+                                                               schema=self.parquet_writer.schema))
+
+    def close(self):
+        """
+        Finishes the output file. Formats which need their length up front are written out here.
+        """
+        if self.output_format == 'npy':
+            with open(self.path, "wb", buffering=self.buffer_bytes) as file:
+                self.record_writer.close(file=file)
+        elif self.output_format == 'npz':
+            with zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+                for column, writer in self.column_writers.items():
+                    with archive.open(f"{column}.npy", "w", force_zip64=True) as member:
+                        writer.close(file=member)
+        elif self.output_format == 'csv':
+            self.file.close()
+        else:
+            self.parquet_writer.close()
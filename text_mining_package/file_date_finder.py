@@ -0,0 +1,122 @@
+import codecs
+import functools
+import mmap
+import os
+import typing
+
+from text_mining_package.batch_date_finder import find_date, map_in_order
+
+
+def split_file(path: typing.Union[str, os.PathLike], chunk_bytes: int = 1, start: int = 0,
+               stop: int = None) -> typing.Iterator[tuple]:
+    """
+    The purpose of this function is to cut a file into newline aligned byte ranges of roughly chunk_bytes each.
+    The file is memory mapped, so only the bytes around each cut are read.
+    :param path: path of the note file
+    :param chunk_bytes: target size of a chunk in bytes
+    :param start: byte offset to start from, the start of a line.
+    :param stop: byte offset to stop at, the end of a line. None is the end of the file.
+    :return: iterator of (start, end) byte offsets, end exclusive.
+    """
+    size = os.path.getsize(path)
+    stop = size if stop is None else min(stop, size)
+    if start >= stop:
+        return
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        while start < stop:
+            end = min(start + chunk_bytes, stop)
+            newline = mapped.find(b"\n", end - 1, stop)
+            end = stop if newline == -1 else newline + 1
+            yield start, end
+            start = end
+
+
+@functools.lru_cache(maxsize=16)
+def ascii_compatible(encoding: str = "utf-8") -> bool:
+    """
+    Tells whether ASCII bytes mean the same characters in encoding (utf-8, latin-1, cp1252, ...), so ASCII lines can
+    be searched without decoding them.
+    :param encoding: text encoding
+    :return: boolean
+    """
+    ascii_bytes = bytes(range(128))
+    try:
+        return codecs.decode(ascii_bytes, encoding) == ascii_bytes.decode("ascii")
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+
+def strip_line_end(raw_line: bytes = bytes()) -> bytes:
+    """
+    Drops the line ending of a line. A line of a note file ends at \n, which is where split_file cuts chunks and where
+    update_date_store and the date server see line ends; one \r in front of it (Windows files) goes with it. A \r
+    anywhere else is part of the note.
+    :param raw_line: line, with or without its line ending
+    :return: line without its line ending
+    """
+    if raw_line.endswith(b"\n"):
+        raw_line = raw_line[:-1]
+    return raw_line[:-1] if raw_line.endswith(b"\r") else raw_line
+
+
+def read_chunk_lines(byte_range: tuple = (), path: str = str(), encoding: str = "utf-8",
+                     decode: bool = True) -> typing.Iterator[tuple]:
+    """
+    The purpose of this function is to read the lines of one chunk of a note file. The file is mapped by the caller's
+    process itself, so only the byte range has to travel to a worker, and only one chunk of the file is turned into
+    Python strings at a time.
+    :param byte_range: (start, end) byte offsets of the chunk
+    :param path: path of the note file
+    :param encoding: text encoding of the file, undecodable bytes are replaced.
+    :param decode: when False, lines are handed out as bytes, as they are in the file.
+    :return: iterator of (byte offset, line text without its line ending)
+    """
+    start, end = byte_range
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        chunk = mapped[start:end]
+
+    # Split at \n only, see strip_line_end. The empty piece after the last \n is not a line.
+    raw_lines = chunk.split(b"\n")
+    if not raw_lines[-1]:
+        raw_lines.pop()
+    byte_offset = start
+    for raw_line in raw_lines:
+        line = strip_line_end(raw_line=raw_line)
+        yield byte_offset, line.decode(encoding, errors="replace") if decode else line
+        byte_offset += len(raw_line) + 1
+
+
+def find_dates_in_file_chunk(byte_range: tuple = (), path: str = str(), encoding: str = "utf-8") -> list:
+    """
+    Worker side of find_dates_in_file.
+    :param byte_range: (start, end) byte offsets of the chunk
+    :param path: path of the note file
+    :param encoding: text encoding of the file
+    :return: list of (line number within the chunk, byte offset, datetime.date or None)
+    """
+    return [(line_number, byte_offset, find_date(raw_text=raw_text)) for line_number, (byte_offset, raw_text) in
+            enumerate(read_chunk_lines(byte_range=byte_range, path=path, encoding=encoding))]
+
+
+def find_dates_in_file(path: typing.Union[str, os.PathLike], workers: int = 1, chunk_bytes: int = 1 << 24,
+                       encoding: str = "utf-8") -> typing.Iterator[tuple]:
+    """
+    The purpose of this function is to extract the date of every line of a note file of any size with bounded memory.
+    The file is memory mapped and split into newline aligned chunks which are processed by the workers, in order.
+    :param path: path of the note file, one note per line.
+    :param workers: number of worker processes. 1 runs in the calling process.
+    :param chunk_bytes: target size of a chunk in bytes.
+    :param encoding: text encoding of the file.
+    :return: iterator of (line number, byte offset of the line, datetime.date or None), line numbers start at 0.
+    """
+    if chunk_bytes < 1:
+        raise ValueError("chunk_bytes must be at least 1")
+
+    path = os.fspath(path)
+    chunk_function = functools.partial(find_dates_in_file_chunk, path=path, encoding=encoding)
+    first_line = 0
+    for records in map_in_order(function=chunk_function, tasks=split_file(path=path, chunk_bytes=chunk_bytes),
+                                workers=workers):
+        for line_number, byte_offset, date in records:
+            yield first_line + line_number, byte_offset, date
+        first_line += len(records)
@@ -1,10 +1,10 @@
+import calendar
+import math
 import re
 import typing
 from dataclasses import dataclass
 from functools import lru_cache
 
-import numpy as np
-
 
 @dataclass
 class NicDate(dict):
@@ -31,17 +31,17 @@ class NicDate(dict):
     def __repr__(self):
         return f"Day = {self.date} Month = {self.month} Year = {self.year}"
 
-    @lru_cache(maxsize=2)
     @staticmethod
+    @lru_cache(maxsize=1)
     def month_names_short() -> tuple:
         mns = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
         return mns
 
-    @lru_cache(maxsize=2)
     @staticmethod
+    @lru_cache(maxsize=1)
     def month_names_long() -> tuple:
         mnl = (
-        'january', 'february', 'march', 'april', 'May', 'june', 'july', 'august', 'september', 'october', 'november',
+        'january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september', 'october', 'november',
         'december',)
         return mnl
 
@@ -71,127 +71,94 @@ class NicDate(dict):
         return month_conversion_dict
 
     @staticmethod
-    def find_largest_day(result_month: int = 0) -> dict:
+    @lru_cache(maxsize=1)
+    def month_numbers() -> dict:
         """
-        The purpose of this function is to determine the largest day in the month. It supports date validation utilities
-        At some point I'd like to add leap year functionality to it
-        TODO: Add leap year functionality someday.
-        :param result_month: integer
-        :return: integer
+        The purpose of this function is to look up captured month names, str or ASCII bytes, lower cased.
+        :return: dictionary of lower case month names, as str and as bytes, to the numbers 1-12
         """
-        largest_day_dict = {1: 31, 2: 29, 3: 31, 4: 30, 5: 31, 6: 30, 7: 31, 8: 31, 9: 30, 10: 31, 11: 30, 12: 31}
-        largest_day = largest_day_dict.get(result_month, np.nan)
-        return largest_day
+        month_numbers = {month.lower(): number for month, number in NicDate.month_conversion_dict().items()}
+        month_numbers.update({month.encode("ascii"): number for month, number in month_numbers.items()})
+        return month_numbers
 
-    def is_valid_year(self, year: typing.Union[int, str] = None) -> bool:
+    @staticmethod
+    def date_parts(result_dict: dict = None) -> tuple:
         """
-        The purpose of this function is to determine whether a year (either int or string) is a valid year.
-        Accommodates two digits and four digit values.
-
-        :param year: Either string or integer representing year
-        :return: bool True if  year is valid.
+        The purpose of this function is to turn the groups of a date match into year, month and day numbers, with the
+        rules of the project: two digit years are 19XX, a missing month or day is 1, an out of range numeric month is
+        1, and a month word which is not a month name gives month 0 (no date).
+        All date builders use it: DateFinderx.create_pydate, find_date and date_records_from_notes.
+        :param result_dict: group dictionary of a date match, with str or bytes values.
+        :return: (year, month, day) integers
         """
-        valid_year = True
-        # ~~~~~~~~~~~~~~~~~~~
-        # Test the year first
-        # ~~~~~~~~~~~~~~~~~~~
-        if year is None:
-            valid_year = False
-            return valid_year
-
-        # ~~~~~~~~~~~~~~~~~~~
-        # Accommodate Strings
-        # ~~~~~~~~~~~~~~~~~~~
-        if not isinstance(year, int):
-            year = int(year)
-
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # Check between 0 and 100 for two digit range (pretty much any two digit)
-        # Check between 1900 and 2030 for a valid year digit.
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # Note- Any is used here to speed up analysis with switching.
-        if not any((0 < year < 100, 1900 < year < 2030)):
-            valid_year = False
-        return valid_year
-
-    def is_valid_month(self, month: typing.Union[int, str] = None):
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # None is an acceptable value for month.
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        if month is None:
-            return True
-
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # Handle the case where digits are passed either directly or as a non string
-        #  ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        if (isinstance(month, str) and month.isdigit()) or isinstance(month, int):
-            valid_month = 0 < int(month) < 13
-            return valid_month
-
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # Handle the name case where a name is passed.
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        elif isinstance(month, str):
-            valid_month = any((month.lower() in self.month_names_short, month.lower() in self.month_names_long))
-            return valid_month
-
-    def is_valid_day(self, month: typing.Union[int, str] = None, day: typing.Union[int, str] = None):
-
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # If there's no month, then the day doesn't matter, so its ok
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        if month is None:
-            return True
-
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # By clearing non valid months here, we eliminate having to put a lot of error checking in the code below.
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        if not self.is_valid_month(month):
-            return False
-
-        if month.isalpha():
-            month = self.month_conversion_dict().get(month, None)
+        year = int(result_dict['year'])
+        month_seed = result_dict.get('month')
+        if not month_seed:
+            month = 1
+        elif month_seed.isdigit():
+            month = int(month_seed)
+            month = month if 0 < month < 13 else 1
         else:
-            month = int(month)
-        day = np.uint8(day)
-        is_valid_day = 0 < day < self.find_largest_day(result_month=month)
-        return is_valid_day
+            month = NicDate.month_numbers().get(month_seed.lower(), 0)
+        return year + 1900 if year < 100 else year, month, int(result_dict.get('day') or 1)
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def month_typo_dict() -> dict:
+        """
+        The purpose of this function is to create a dictionary where keys are misspelled month names, and the values
+        are the month names they stand for, so a misspelling is resolved with one lookup per word instead of more regex
+        alternatives.
+        Long names of six letters or more get every variant one edit away (a letter dropped, added, changed, or two
+        neighbouring letters swapped), except a letter added at the end (Augusta, Octobers). March and April only get
+        swapped letters, because their other variants are often real words (match, marsh, arch). Short names and
+        June/July get none, for the same reason. Variants which could stand for two months, or which are month names
+        already, are left out.
+
+        :return: dictionary of lower case misspellings to lower case month names, e.g. {'janaury': 'january'}
+        """
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        exact = set(NicDate.month_conversion_dict())
+        variants = {}
+        for name in NicDate.month_names_long():
+            if len(name) < 5:
+                continue
+            splits = [(name[:cut], name[cut:]) for cut in range(len(name) + 1)]
+            name_variants = {head + tail[1] + tail[0] + tail[2:] for head, tail in splits if len(tail) > 1}
+            if len(name) >= 6:
+                name_variants.update(head + tail[1:] for head, tail in splits if tail)
+                name_variants.update(head + letter + tail[1:] for head, tail in splits if tail for letter in letters)
+                name_variants.update(head + letter + tail for head, tail in splits[:-1] for letter in letters)
+            for variant in name_variants - exact:
+                variants.setdefault(variant, set()).add(name)
+        typo_dict = {variant: names.pop() for variant, names in variants.items() if len(names) == 1}
+        # Common abbreviations which are not one of the three letter names.
+        typo_dict.update({'sept': 'sep'})
+        return typo_dict
+
+    @staticmethod
+    def find_largest_day(result_month: int = 0, result_year: int = None) -> typing.Union[int, float]:
+        """
+        The purpose of this function is to determine the largest day in the month. It supports date validation utilities
+        February has 29 days in leap years, and when the year is not known.
+        :param result_month: integer
+        :param result_year: integer, four digit year (optional)
+        :return: integer, or math.nan when result_month is not a month number
+        """
+        largest_day_dict = {1: 31, 2: 29, 3: 31, 4: 30, 5: 31, 6: 30, 7: 31, 8: 31, 9: 30, 10: 31, 11: 30, 12: 31}
+        largest_day = largest_day_dict.get(result_month, math.nan)
+        if result_month == 2 and result_year is not None and not calendar.isleap(result_year):
+            largest_day = 28
+        return largest_day
 
     def valid_date(self, in_match_result: re.Match):
         """
         The purpose of this function is to determine the validity of a match object returned from regex.
         It returns a score from 0 to 8 with 8 being the most likely valid date, and 0 being not a valid date, and 8
-        being the most likely date.
+        being the most likely date. Scores come from the precomputed DateValidityTable.
         :param in_match_result: A dictionary generated by group date of regex.
         :return: integer from 0-8
-        :rtype np.uint8:
+        :rtype int:
         """
-
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # First test the year. If the year isn't valid then forget about it
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        in_match_result = in_match_result.groupdict()
-
-        year_result = self.is_valid_year(year=in_match_result.get('year', None))
-        if not year_result:
-            return np.uint8(0)
-        else:
-            validity_score = 1
-
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # Test the month. a Null Month is OK, else bump validity score to 4
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        month_result = self.is_valid_month(month=in_match_result.get('month', None))
-        if not month_result:
-            return validity_score
-        else:
-            validity_score += 3
-
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        # Test the day.
-        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-
-        day_result = self.is_valid_day(month=in_match_result.get('month', None), day=in_match_result.get('day', None))
-        if day_result:
-            validity_score += 4
-        return validity_score
+        from text_mining_package.date_validity_table import DateValidityTable
+        return DateValidityTable.default_table().score_group_dict(group_dict=in_match_result.groupdict())
@@ -0,0 +1,71 @@
+import collections
+
+
+class ResultCache:
+    """
+    The purpose of this class is to remember extraction results for repeated note text, so a line seen before is not
+    matched again. Keys are cleaned lines (DateFinderx.clean_text), so notes differing only in punctuation or spacing
+    share an entry. Once maxsize entries are stored, the least recently used one is dropped.
+    One cache can be handed to find_date, find_dates and iter_date_records, and kept across calls. Values are whatever
+    the caller stores, so one cache should only be used for one kind of result.
+    :param maxsize: largest number of entries kept.
+    """
+
+    missing = object()
+
+    def __init__(self, maxsize: int = 65536):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key: str = str(), default=None):
+        """
+        Looks a key up, counting a hit or a miss. A hit makes the entry the most recently used.
+        :param key: cleaned line
+        :param default: returned when the key is not stored, ResultCache.missing tells a stored None apart.
+        :return: stored value or default
+        """
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str = str(), value=None):
+        """
+        Stores a value, dropping the least recently used entries past maxsize.
+        :param key: cleaned line
+        :param value: result for the line
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every entry and sets the counters back to zero.
+        """
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        :return: dictionary of hits, misses, evictions, current size and maxsize.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self.entries),
+                'maxsize': self.maxsize}
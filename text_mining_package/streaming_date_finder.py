@@ -0,0 +1,200 @@
+import argparse
+import asyncio
+import concurrent.futures
+import functools
+import typing
+
+from text_mining_package.batch_date_finder import find_dates_in_chunk, init_worker
+from text_mining_package.file_date_finder import strip_line_end
+
+# Marks the end of the note feed in the note queue.
+END_OF_NOTES = object()
+
+
+def create_executor(workers: int = 1) -> concurrent.futures.Executor:
+    """
+    Builds the pool batches are sent to: one thread for a single worker, so the event loop stays free, otherwise a
+    process pool whose workers compile the date matcher once at start.
+    :param workers: number of workers
+    :return: concurrent.futures.Executor
+    """
+    init_worker()
+    if workers <= 1:
+        return concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+
+
+async def read_notes(notes: typing.Union[typing.AsyncIterable[str], typing.Iterable[str]], note_queue: asyncio.Queue):
+    """
+    Moves notes from the feed into the note queue. The queue is bounded, so the feed is only read as fast as batches
+    are taken out. The end marker is always queued, even when the feed fails.
+    :param notes: async or plain iterable of note strings
+    :param note_queue: bounded asyncio.Queue
+    """
+    try:
+        if hasattr(notes, "__aiter__"):
+            async for note in notes:
+                await note_queue.put(note)
+        else:
+            for note in notes:
+                await note_queue.put(note)
+    finally:
+        await note_queue.put(END_OF_NOTES)
+
+
+async def batch_notes(note_queue: asyncio.Queue, batch_size: int = 256,
+                      max_delay: float = 0.005) -> typing.AsyncIterator[tuple]:
+    """
+    The purpose of this function is to group queued notes into micro-batches. A batch is closed when it holds
+    batch_size notes, or max_delay seconds after its first note arrived, whichever comes first, so a slow feed never
+    waits longer than max_delay for its results.
+    :param note_queue: asyncio.Queue filled by read_notes
+    :param batch_size: largest number of notes in a batch
+    :param max_delay: seconds a batch may wait for more notes
+    :return: async iterator of tuples of notes
+    """
+    loop = asyncio.get_running_loop()
+    while (note := await note_queue.get()) is not END_OF_NOTES:
+        batch = [note]
+        deadline = loop.time() + max_delay
+        while len(batch) < batch_size:
+            # Notes already queued are taken without waiting, only an empty queue needs a timed wait.
+            if not note_queue.empty():
+                note = note_queue.get_nowait()
+            else:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    note = await asyncio.wait_for(note_queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+            if note is END_OF_NOTES:
+                yield tuple(batch)
+                return
+            batch.append(note)
+        yield tuple(batch)
+
+
+async def stream_dates(notes: typing.Union[typing.AsyncIterable[str], typing.Iterable[str]], workers: int = 1,
+                       batch_size: int = 256, max_delay: float = 0.005, max_pending: int = None,
+                       executor: concurrent.futures.Executor = None) -> typing.AsyncIterator:
+    """
+    The purpose of this function is to extract dates from a continuous feed of notes without blocking the event loop.
+    Notes are gathered into micro-batches (see batch_notes) and run by find_dates_in_chunk in a worker pool. At most
+    max_pending batches are in flight; when they are all busy the feed is no longer read, which is the backpressure.
+    Results come back in feed order.
+    :param notes: async or plain iterable of note strings
+    :param workers: number of workers of the pool created when no executor is given.
+    :param batch_size: largest number of notes in a batch
+    :param max_delay: seconds a batch may wait for more notes
+    :param max_pending: largest number of batches in flight, two per worker by default.
+    :param executor: pool to use, it is left running. A pool is created, and shut down at the end, when it is None.
+    :return: async iterator of datetime.date or None, one per note.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    if own_executor:
+        executor = create_executor(workers=workers)
+    note_queue = asyncio.Queue(maxsize=batch_size)
+    batch_queue = asyncio.Queue(maxsize=max_pending or 2 * max(workers, 1))
+
+    async def dispatch():
+        reader = asyncio.ensure_future(read_notes(notes=notes, note_queue=note_queue))
+        try:
+            async for batch in batch_notes(note_queue=note_queue, batch_size=batch_size, max_delay=max_delay):
+                await batch_queue.put(loop.run_in_executor(executor, find_dates_in_chunk, batch))
+            await reader
+        except Exception as error:
+            failed = loop.create_future()
+            failed.set_exception(error)
+            await batch_queue.put(failed)
+        finally:
+            reader.cancel()
+        await batch_queue.put(None)
+
+    dispatcher = asyncio.ensure_future(dispatch())
+    try:
+        while (batch_result := await batch_queue.get()) is not None:
+            for date in await batch_result:
+                yield date
+    finally:
+        dispatcher.cancel()
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                            executor: concurrent.futures.Executor = None, batch_size: int = 256,
+                            max_delay: float = 0.005):
+    """
+    Line protocol of the date server: every UTF-8 line received is a note, and every note gets one line back, in
+    order, holding its date as YYYY-MM-DD or nothing when no date was found.
+    :param reader: stream of the connection
+    :param writer: stream of the connection
+    :param executor: pool shared by every connection
+    :param batch_size: largest number of notes in a batch
+    :param max_delay: seconds a batch may wait for more notes
+    """
+
+    async def received_notes():
+        while line := await reader.readline():
+            yield strip_line_end(raw_line=line).decode("utf-8", errors="replace")
+
+    try:
+        async for date in stream_dates(notes=received_notes(), batch_size=batch_size, max_delay=max_delay,
+                                       executor=executor):
+            writer.write(date.isoformat().encode("ascii") + b"\n" if date is not None else b"\n")
+            # A client not reading its results stops the server from reading its notes.
+            if writer.transport.get_write_buffer_size() > 1 << 16:
+                await writer.drain()
+        await writer.drain()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def start_date_server(executor: concurrent.futures.Executor, host: str = "127.0.0.1", port: int = 8765,
+                            batch_size: int = 256, max_delay: float = 0.005) -> asyncio.AbstractServer:
+    """
+    The purpose of this function is to start a local date server speaking the line protocol of handle_connection.
+    Every connection shares executor, the caller shuts it down after closing the server.
+    :param executor: pool made by create_executor
+    :param host: address to listen on, local only by default.
+    :param port: port to listen on, 0 picks a free one.
+    :param batch_size: largest number of notes in a batch
+    :param max_delay: seconds a batch may wait for more notes
+    :return: asyncio server, already serving.
+    """
+    handler = functools.partial(handle_connection, executor=executor, batch_size=batch_size, max_delay=max_delay)
+    return await asyncio.start_server(handler, host=host, port=port)
+
+
+async def serve_dates(host: str = "127.0.0.1", port: int = 8765, workers: int = 1, batch_size: int = 256,
+                      max_delay: float = 0.005):
+    """
+    Runs the date server until it is cancelled.
+    """
+    executor = create_executor(workers=workers)
+    try:
+        server = await start_date_server(executor=executor, host=host, port=port, batch_size=batch_size,
+                                         max_delay=max_delay)
+        async with server:
+            await server.serve_forever()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local date server: send notes one per line, get dates back.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--max-delay", type=float, default=0.005, help="seconds a batch may wait for more notes")
+    arguments = parser.parse_args()
+    asyncio.run(serve_dates(host=arguments.host, port=arguments.port, workers=arguments.workers,
+                            batch_size=arguments.batch_size, max_delay=arguments.max_delay))
@@ -0,0 +1,176 @@
+import re
+import typing
+
+from text_mining_package.nic_date_date_class import NicDate
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Normalizing a note: a translate table drops period, comma, colon and semicolon, split and join turn every run of
+# whitespace into one space (dropping it at both ends), and one regex pass drops the ordinal suffix of a day number
+# next to a month name (Mar 21st, 21st Mar, 2nd Janaury). Other ordinals stay, so "4th day 1990" is not read as a day,
+# month word and year. ASCII notes, the usual case, are done on bytes, where all three steps are cheapest.
+# The bytes table also turns \x1c-\x1f into spaces, because str.split counts them as whitespace and bytes.split does
+# not.
+# Misspelled month names (Janaury, Sept) are then replaced by the month name, looked up word by word in
+# NicDate.month_typo_dict. Most notes have none, which one translate (letters lower cased, everything else a space),
+# one split and one set check find out.
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+PUNCTUATION = ".,;:"
+BYTES_PUNCTUATION = PUNCTUATION.encode("ascii")
+STR_TABLE = str.maketrans("", "", PUNCTUATION)
+BYTES_TABLE = bytes.maketrans(b"\x1c\x1d\x1e\x1f", b"    ")
+STR_ORDINAL = re.compile(r"(?:\b(?P<before>[A-Za-z]+) )?\b[0-9]{1,2}(?P<suffix>st|nd|rd|th)\b"
+                         r"(?=(?: (?P<after>[A-Za-z]+)\b)?)", flags=re.IGNORECASE)
+BYTES_ORDINAL = re.compile(STR_ORDINAL.pattern.encode("ascii"), flags=re.IGNORECASE)
+STR_WORD = re.compile(r"\S+")
+BYTES_WORD = re.compile(rb"\S+")
+STR_MONTH_TYPOS = NicDate.month_typo_dict()
+BYTES_MONTH_TYPOS = {typo.encode("ascii"): month.encode("ascii") for typo, month in STR_MONTH_TYPOS.items()}
+STR_LETTERS = re.compile(r"[A-Za-z]+")
+BYTES_LETTERS = re.compile(rb"[A-Za-z]+")
+STR_MONTH_WORDS = {month for month in NicDate.month_numbers() if isinstance(month, str)} | set(STR_MONTH_TYPOS)
+BYTES_MONTH_WORDS = {month.encode("ascii") for month in STR_MONTH_WORDS}
+LETTERS_TABLE = bytes(character | 0x20 if chr(character).isascii() and chr(character).isalpha() else 0x20
+                      for character in range(256))
+
+Text = typing.TypeVar("Text", str, bytes)
+
+
+def normalize_text(raw_text: Text) -> Text:
+    """
+    The purpose of this function is to prepare a note for the date patterns: punctuation (.,;:) and the ordinal
+    suffixes of days next to a month name are removed, and whitespace is turned into single spaces.
+    :param raw_text: note as str or bytes. Bytes are taken as ASCII, other bytes are left alone.
+    :return: normalized note, of the same type as raw_text.
+    """
+    if isinstance(raw_text, bytes):
+        return correct_months(
+            text=strip_ordinals(text=b" ".join(raw_text.translate(BYTES_TABLE, BYTES_PUNCTUATION).split())))
+    if raw_text.isascii():
+        return normalize_text(raw_text=raw_text.encode("ascii")).decode("ascii")
+    return correct_months(text=strip_ordinals(text=" ".join(raw_text.translate(STR_TABLE).split())))
+
+
+def ordinal_spans(text: Text) -> list:
+    """
+    The purpose of this function is to find the ordinal suffixes to drop: those of a one or two digit number with a
+    month name, or a misspelling of one, as the word before or after it ("Mar 21st", "21st Mar").
+    :param text: note as str or bytes (ASCII), with punctuation removed and single spaces.
+    :return: list of (start, end) of the suffixes
+    """
+    ordinal, months = (BYTES_ORDINAL, BYTES_MONTH_WORDS) if isinstance(text, bytes) else (STR_ORDINAL, STR_MONTH_WORDS)
+    return [match.span('suffix') for match in ordinal.finditer(text)
+            if any(word is not None and word.lower() in months for word in match.group('before', 'after'))]
+
+
+def strip_ordinals(text: Text) -> Text:
+    """
+    :param text: note as str or bytes (ASCII), with punctuation removed and single spaces.
+    :return: text without the ordinal suffixes of ordinal_spans
+    """
+    spans = ordinal_spans(text=text)
+    if not spans:
+        return text
+    ends = [0] + [end for _, end in spans]
+    starts = [start for start, _ in spans] + [len(text)]
+    return text[:0].join(text[end:start] for end, start in zip(ends, starts))
+
+
+def correct_months(text: Text) -> Text:
+    """
+    The purpose of this function is to replace misspelled month names by the lower case month name, so the date
+    patterns, which only know the exact names, find them: "Janaury 5 1990" becomes "january 5 1990".
+    :param text: note as str or bytes (ASCII).
+    :return: text, with its misspelled month names replaced.
+    """
+    if isinstance(text, bytes):
+        if BYTES_MONTH_TYPOS.keys().isdisjoint(text.translate(LETTERS_TABLE).split()):
+            return text
+        typos, letters = BYTES_MONTH_TYPOS, BYTES_LETTERS
+    else:
+        typos, letters = STR_MONTH_TYPOS, STR_LETTERS
+        if typos.keys().isdisjoint(word.lower() for word in letters.findall(text)):
+            return text
+    return letters.sub(lambda word: typos.get(word.group().lower(), word.group()), text)
+
+
+def normalize_text_with_offsets(raw_text: Text) -> tuple:
+    """
+    The purpose of this function is to normalize a note like normalize_text, also keeping where every normalized
+    character came from, so spans found in the normalized note can be reported against the original one.
+    :param raw_text: note as str or bytes.
+    :return: (normalized note, list of the offset in raw_text of each normalized character)
+    """
+    if isinstance(raw_text, bytes):
+        translated, punctuation, space = raw_text.translate(BYTES_TABLE, BYTES_PUNCTUATION), BYTES_PUNCTUATION, b" "
+        word = BYTES_WORD
+    else:
+        translated, punctuation, space = raw_text.translate(STR_TABLE), PUNCTUATION, " "
+        word = STR_WORD
+    kept = [offset for offset, character in enumerate(raw_text) if character not in punctuation]
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # Words joined by single spaces, each space pointing at the first whitespace character of the run it replaces.
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    words = []
+    offsets = []
+    previous_end = 0
+    for match in word.finditer(translated):
+        if words:
+            offsets.append(kept[previous_end])
+        words.append(match.group())
+        offsets.extend(kept[match.start():match.end()])
+        previous_end = match.end()
+    joined = space.join(words)
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # Ordinal suffixes next to a month name go, with their offsets.
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    parts = []
+    ordinal_offsets = []
+    position = 0
+    for start, end in ordinal_spans(text=joined):
+        parts.append(joined[position:start])
+        ordinal_offsets.extend(offsets[position:start])
+        position = end
+    parts.append(joined[position:])
+    ordinal_offsets.extend(offsets[position:])
+    unordinal = joined[:0].join(parts)
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    # Misspelled month names are replaced. The first and last letters of the month name point at the first and last
+    # letters of the misspelling, and the ones in between at the letters in between, as far as there are any.
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    if correct_months(text=unordinal) is unordinal:
+        return unordinal, ordinal_offsets
+    typos, letters = (BYTES_MONTH_TYPOS, BYTES_LETTERS) if isinstance(unordinal, bytes) else (STR_MONTH_TYPOS,
+                                                                                               STR_LETTERS)
+    parts = []
+    month_offsets = []
+    position = 0
+    for match in letters.finditer(unordinal):
+        month = typos.get(match.group().lower())
+        if month is None:
+            continue
+        parts.extend((unordinal[position:match.start()], month))
+        month_offsets.extend(ordinal_offsets[position:match.start()])
+        word_offsets = ordinal_offsets[match.start():match.end()]
+        month_offsets.extend(word_offsets[min(index, len(word_offsets) - 1)] for index in range(len(month) - 1))
+        month_offsets.append(word_offsets[-1])
+        position = match.end()
+    parts.append(unordinal[position:])
+    month_offsets.extend(ordinal_offsets[position:])
+    return unordinal[:0].join(parts), month_offsets
+
+
+def original_span(offsets: typing.Sequence[int], start: int = 0, end: int = 0) -> tuple:
+    """
+    Maps a span of the normalized note back to the original one.
+    :param offsets: offsets from normalize_text_with_offsets
+    :param start: start of the span in the normalized note
+    :param end: end of the span in the normalized note, exclusive.
+    :return: (start, end) in the original note
+    """
+    if start >= end:
+        position = offsets[start] if start < len(offsets) else (offsets[-1] + 1 if offsets else 0)
+        return position, position
+    return offsets[start], offsets[end - 1] + 1
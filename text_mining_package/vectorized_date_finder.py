@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from text_mining_package import DateMatcher, NicDate
+from text_mining_package.date_validity_table import DateValidityTable
+from text_mining_package.text_normalizer import normalize_text
+
+
+def capture_date_parts(notes: pd.Series) -> pd.DataFrame:
+    """
+    The purpose of this function is to find the month, day and year strings of every row. Matching is one
+    DateMatcher.search_match per row, like Series.str.extract runs one regex search per row, but a single scan covers
+    all the date families and picks the best candidate of the row. The parts are gathered in one list and handed to
+    the DataFrame once.
+    :param notes: Series of raw note strings, missing values are taken as empty notes.
+    :return: DataFrame of month, day and year strings (None where absent), with the index of notes
+    """
+    matcher = DateMatcher.default_matcher()
+    parts = []
+    for note in notes.fillna("").astype(str):
+        _, match = matcher.search_match(search_text=normalize_text(raw_text=note))
+        result_dict = {} if match is None else match.groupdict()
+        parts.append((result_dict.get('month'), result_dict.get('day'), result_dict.get('year')))
+    return pd.DataFrame(data=parts, columns=['month', 'day', 'year'], index=notes.index, dtype=object)
+
+
+def decimal_numbers(part_text: pd.Series, default: int = 0) -> np.ndarray:
+    """
+    :param part_text: Series of captured part strings, None where absent.
+    :param default: number for the rows which are absent, empty or not a decimal number.
+    :return: numpy int64 array of the numbers
+    """
+    part_text = part_text.fillna("")
+    return part_text.where(part_text.str.isdecimal()).map(int, na_action='ignore').fillna(default).to_numpy(
+        dtype=np.int64)
+
+
+def resolve_date_parts(parts: pd.DataFrame) -> tuple:
+    """
+    The purpose of this function is to apply the rules of NicDate.date_parts to whole columns of captured parts, as
+    masked array operations: two digit years are 19XX, a missing month or day is 1, an out of range numeric month is
+    1, and a month word which is not a month name gives month 0. Rows without a match get 0 for all three parts.
+    :param parts: DataFrame of month, day and year strings, from capture_date_parts
+    :return: (years, months, days) numpy int64 arrays
+    """
+    found = parts['year'].notna().to_numpy()
+    years = decimal_numbers(part_text=parts['year'])
+    years = np.where(years < 100, years + 1900, years)
+
+    month_text = parts['month'].fillna("")
+    numeric_months = decimal_numbers(part_text=month_text)
+    named_months = month_text.str.lower().map(NicDate.month_numbers()).fillna(0).to_numpy(dtype=np.int64)
+    months = np.select(condlist=[(month_text == "").to_numpy(), month_text.str.isdecimal().to_numpy()],
+                       choicelist=[1, np.where((numeric_months > 0) & (numeric_months < 13), numeric_months, 1)],
+                       default=named_months)
+
+    days = decimal_numbers(part_text=parts['day'], default=1)
+    return np.where(found, years, 0), np.where(found, months, 0), np.where(found, days, 0)
+
+
+def extract_date_columns(notes: pd.Series) -> pd.DataFrame:
+    """
+    The purpose of this function is to extract dates from a whole column of notes without building a DateFinderx or a
+    datetime.date per row. The rows are matched by capture_date_parts, then the fallback rules (resolve_date_parts)
+    and the dates (DateValidityTable.calendar_dates) are worked out for the whole column in array operations.
+    Rows without a date get 0 for the parts and NaT for the date.
+    :param notes: Series of raw note strings, missing values are taken as empty notes.
+    :return: DataFrame with the index of notes, and columns year, month, day (integers) and date (datetime64).
+    """
+    years, months, days = resolve_date_parts(parts=capture_date_parts(notes=notes))
+    date = DateValidityTable.calendar_dates(years=years, months=months, days=days)
+    return pd.DataFrame(data={'year': years, 'month': months, 'day': days, 'date': date}, index=notes.index)